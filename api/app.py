@@ -2,17 +2,24 @@ from flask import Flask
 
 from .auth import auth_bp, init_oidc
 from .cli import register_cli
+from .compression import init_compression
 from .config import get_config
+from .database import init_engine
 from .extensions import cors, db, login_manager, migrate
+from .health import health_bp
 from .imports import import_bp
 from .routes import main_bp
+from .serialization import init_json
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(get_config())
 
+    init_json(app)
+    init_compression(app)
     db.init_app(app)
+    init_engine(app, db)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     # CORS is not credentialed: the frontend always talks to the API same-origin
@@ -22,6 +29,7 @@ def create_app():
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(import_bp)
+    app.register_blueprint(health_bp)
 
     if app.config.get('SSO_ENABLED'):
         init_oidc(app)
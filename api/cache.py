@@ -0,0 +1,250 @@
+"""Cache of serialized beverage payloads (list summaries and detail views).
+
+The backend is chosen by CACHE_BACKEND:
+
+- 'local': an LRU with TTL in this process's memory.
+- 'filesystem': one file per entry under CACHE_DIR, shared by every worker
+  on the host.
+- 'redis': any Redis-compatible server at CACHE_REDIS_URL, shared across
+  replicas.
+- 'null': disables caching.
+
+Entries are per beverage, keyed by the catalog version (see
+api/versioning.py) that every committed catalog write bumps, so a write
+retires all entries at once, in every worker and on every backend; old
+ones just age out. Deleting keys instead would race: a reader that loaded
+a payload just before a write committed could store it right after the
+delete. Here that late write lands under a version no one reads any more,
+since the version is always read before the data it labels.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app
+
+from .versioning import CATALOG, current_version
+
+SUMMARY = 'summary'
+DETAIL = 'detail'
+
+
+class NullCache:
+    def get_many(self, keys):
+        return {}
+
+    def set_many(self, mapping):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LocalCache:
+    """Thread-safe LRU whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at < now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, mapping):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in mapping.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileSystemCache:
+    """JSON files in `directory`, expired by modification time. Writes go
+    through a temp file and a rename, so readers never see half an entry.
+    Entries of retired versions are never read again, so expired files are
+    swept from the directory at most once per `ttl`."""
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        self.ttl = ttl
+        self._swept_at = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def get_many(self, keys):
+        found = {}
+        cutoff = time.time() - self.ttl
+        for key in keys:
+            path = self._path(key)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    continue
+                with open(path, 'rb') as f:
+                    found[key] = json.loads(f.read())
+            except (OSError, ValueError):
+                continue
+        return found
+
+    def set_many(self, mapping):
+        for key, value in mapping.items():
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(value).encode())
+            os.replace(tmp_path, self._path(key))
+        if time.monotonic() - self._swept_at > self.ttl:
+            self._swept_at = time.monotonic()
+            self._sweep()
+
+    def _sweep(self):
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class RedisCache:
+    def __init__(self, url, ttl, prefix='cask-and-cup:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, mapping):
+        with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _create_backend(config):
+    name = config['CACHE_BACKEND']
+    ttl = config['CACHE_TTL']
+    if name == 'local':
+        return LocalCache(config['CACHE_MAX_ENTRIES'], ttl)
+    if name == 'filesystem':
+        return FileSystemCache(config['CACHE_DIR'], ttl)
+    if name == 'redis':
+        return RedisCache(config['CACHE_REDIS_URL'], ttl)
+    if name == 'null':
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND '{name}'.")
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _create_backend(current_app.config)
+        return _backend
+
+
+@contextmanager
+def override_backend(backend):
+    """Serve from `backend` for the duration, e.g. NullCache() to measure
+    the uncached path."""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    try:
+        yield backend
+    finally:
+        with _backend_lock:
+            _backend = previous
+
+
+def _count(**deltas):
+    with _stats_lock:
+        for name, delta in deltas.items():
+            _stats[name] += delta
+
+
+def cache_stats() -> dict:
+    """This worker's counters (each gunicorn worker keeps its own)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+    stats['backend'] = current_app.config['CACHE_BACKEND']
+    stats['pid'] = os.getpid()
+    return stats
+
+
+def _key(kind, beverage_id):
+    current = current_version(CATALOG)
+    return f'beverage:{beverage_id}:{kind}:v{current.version if current else 0}'
+
+
+def cached_payloads(kind, beverage_ids, load):
+    """Serialized payloads of `kind` for `beverage_ids`, keyed by id. Misses
+    are produced in one batch by `load(missing_ids)`, which returns
+    {id: payload}, and written back."""
+    backend = get_backend()
+    keys = {beverage_id: _key(kind, beverage_id) for beverage_id in beverage_ids}
+    found = backend.get_many(keys.values())
+    payloads = {beverage_id: found[key] for beverage_id, key in keys.items() if key in found}
+
+    missing = [beverage_id for beverage_id in keys if beverage_id not in payloads]
+    _count(hits=len(payloads), misses=len(missing))
+    if missing:
+        loaded = load(missing)
+        backend.set_many({keys[beverage_id]: payload for beverage_id, payload in loaded.items()})
+        payloads.update(loaded)
+    return payloads
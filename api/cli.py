@@ -1,10 +1,23 @@
+import json
+import time
+
 import click
+from flask import current_app
 from flask.cli import AppGroup
 
+from .cache import NullCache, cache_stats, get_backend, override_backend
 from .extensions import db
-from .models import User
+from .images import ORIGINAL, set_beverage_image
+from .models import Beverage, BeverageImage, User
+from .search import rebuild_search_index
+from .stats import refresh_rating_stats
+from .versioning import CATALOG, bump_version
 
 user_cli = AppGroup('user', help='Manage local user accounts.')
+stats_cli = AppGroup('stats', help='Maintain materialized rating statistics.')
+images_cli = AppGroup('images', help='Maintain stored beverage images.')
+search_cli = AppGroup('search', help='Maintain the beverage full-text search index.')
+cache_cli = AppGroup('cache', help='Inspect and maintain the beverage payload cache.')
 
 
 @user_cli.command('create')
@@ -31,5 +44,81 @@ def create_user(email, display_name, password, sso_only):
     click.echo(f"Created user '{user.email}' (id={user.id}){suffix}.")
 
 
+@stats_cli.command('rebuild')
+def rebuild_stats():
+    """Recompute every per-beverage and per-type rating aggregate from scratch."""
+    refresh_rating_stats()
+    bump_version(CATALOG)
+    db.session.commit()
+    get_backend().clear()
+    click.echo("Rebuilt rating statistics.")
+
+
+@images_cli.command('variants')
+def rebuild_image_variants():
+    """Regenerate thumbnail/medium variants from every stored original."""
+    beverage_ids = db.session.scalars(
+        db.select(BeverageImage.beverage_id).where(BeverageImage.variant == ORIGINAL)
+    ).all()
+    for beverage_id in beverage_ids:
+        beverage = db.session.get(Beverage, beverage_id)
+        original = beverage.images[ORIGINAL]
+        set_beverage_image(beverage, original.data, original.content_type)
+        db.session.commit()
+    click.echo(f"Regenerated image variants for {len(beverage_ids)} beverage(s).")
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """Re-index every beverage from scratch."""
+    rebuild_search_index()
+    db.session.commit()
+    click.echo("Rebuilt the search index.")
+
+
+@cache_cli.command('clear')
+def clear_cache():
+    """Drop every cached payload (only reaches other workers' entries on a
+    filesystem or redis backend; local ones age out)."""
+    get_backend().clear()
+    click.echo(f"Cleared the '{current_app.config['CACHE_BACKEND']}' cache.")
+
+
+@cache_cli.command('bench')
+@click.option('--requests', 'count', default=200, show_default=True, help='Requests per endpoint and mode.')
+@click.option('--limit', default=50, show_default=True, help='Page size for the listing requests.')
+def bench_cache(count, limit):
+    """Time listing and detail requests with and without the configured cache."""
+    beverage_ids = db.session.scalars(db.select(Beverage.id).order_by(Beverage.id).limit(count)).all()
+    if not beverage_ids:
+        raise click.ClickException("No beverages to benchmark against.")
+    paths = {
+        'list': [f'/api/beverages?limit={limit}&page={i % 5 + 1}' for i in range(count)],
+        'detail': [f'/api/beverages/{beverage_ids[i % len(beverage_ids)]}' for i in range(count)],
+    }
+
+    client = current_app.test_client()
+
+    def run(urls):
+        started = time.perf_counter()
+        for url in urls:
+            client.get(url)
+        return (time.perf_counter() - started) / len(urls) * 1000
+
+    backend = get_backend()
+    for name, urls in paths.items():
+        with override_backend(NullCache()):
+            uncached = run(urls)
+        backend.clear()
+        run(urls)  # warm up
+        cached = run(urls)
+        click.echo(f"{name:<7} uncached {uncached:7.2f} ms/req   cached {cached:7.2f} ms/req   ({uncached / cached:.1f}x)")
+    click.echo(json.dumps(cache_stats()))
+
+
 def register_cli(app):
     app.cli.add_command(user_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(cache_cli)
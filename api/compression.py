@@ -0,0 +1,112 @@
+"""Compression of API responses, so it happens with or without nginx in
+front.
+
+Textual responses of at least COMPRESS_MIN_SIZE bytes are encoded with
+brotli (when the brotli package is importable, as it is in any environment
+synced from uv.lock) or gzip, whichever the client prefers per
+Accept-Encoding. Streamed listings are compressed
+chunk by chunk, with a flush after each so clients still see rows as they
+come; their chunks are whole batches of rows (see `streamed_response`), as
+flushing after every row would cost most of the compression. Images and other files sent with send_file are left alone: they're
+already compressed and served straight from the blob.
+"""
+import gzip
+import importlib.util
+import itertools
+import zlib
+
+from flask import request
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+    'application/javascript',
+}
+
+
+def _brotli():
+    import brotli
+    return brotli
+
+
+def _compress(data, encoding, config):
+    if encoding == 'br':
+        return _brotli().compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'])
+
+
+def _compress_stream(chunks, encoding, config):
+    if encoding == 'br':
+        compressor = _brotli().Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+    # wbits=31: a zlib stream with a gzip header and trailer.
+    compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _read_at_least(chunks, size):
+    """The leading chunks of `chunks`, joined, up to `size` bytes or more
+    (fewer only when the stream ends first)."""
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= size:
+            break
+    return head
+
+
+def init_compression(app):
+    encodings = ['gzip']
+    if importlib.util.find_spec('brotli'):
+        encodings.insert(0, 'br')
+
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not config['COMPRESS_ENABLED'] or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (
+            response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'
+        ):
+            return response
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            # Read ahead far enough to tell whether the stream is worth
+            # compressing; one that ends short is sent as a plain body.
+            chunks = response.iter_encoded()
+            head = _read_at_least(chunks, config['COMPRESS_MIN_SIZE'])
+            if len(head) < config['COMPRESS_MIN_SIZE']:
+                response.set_data(head)
+                return response
+            response.response = _compress_stream(itertools.chain([head], chunks), encoding, config)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(_compress(data, encoding, config))
+        response.headers['Content-Encoding'] = encoding
+
+        # The compressed bytes differ from the identity ones, so a strong
+        # validator no longer describes them exactly.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 def _bool_env(name, default=False):
@@ -8,10 +9,38 @@ def _bool_env(name, default=False):
     return value.strip().lower() in {'1', 'true', 'yes', 'on'}
 
 
+def _engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for `uri`. In-memory SQLite keeps
+    Flask-SQLAlchemy's single shared connection; SQLite's per-connection
+    pragmas are applied on connect (see api/database.py)."""
+    if uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri):
+        return {}
+    options = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+    if uri.startswith('postgresql'):
+        options['pool_pre_ping'] = _bool_env('DB_POOL_PRE_PING', True)
+        statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT', 0))
+        if statement_timeout:
+            options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
 class BaseConfig:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('FLASK_DB_URI', 'sqlite:///products.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    # How type-specific columns are loaded alongside beverages: selectin |
+    # joined | lazy (see _polymorphic_beverages in api/routes.py).
+    POLYMORPHIC_LOADING = os.environ.get('POLYMORPHIC_LOADING', 'selectin')
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
     DEBUG = _bool_env('FLASK_DEBUG')
     SESSION_COOKIE_SECURE = False
 
@@ -25,6 +54,26 @@ class BaseConfig:
         AUTHENTIK_ISSUER and AUTHENTIK_CLIENT_ID and AUTHENTIK_CLIENT_SECRET and OIDC_REDIRECT_URI
     )
 
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    COMPRESS_ENABLED = _bool_env('COMPRESS_ENABLED', True)
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', 2))
+    IMAGE_FETCH_TIMEOUT = float(os.environ.get('IMAGE_FETCH_TIMEOUT', 10))
+    IMAGE_FETCH_MAX_BYTES = int(os.environ.get('IMAGE_FETCH_MAX_BYTES', 15 * 1024 * 1024))
+    IMAGE_FETCH_STALE_AFTER = int(os.environ.get('IMAGE_FETCH_STALE_AFTER', 15 * 60))
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+    IMPORT_PREVIEW_TTL = int(os.environ.get('IMPORT_PREVIEW_TTL', 6 * 60 * 60))
+    IMPORT_JOB_STALE_AFTER = int(os.environ.get('IMPORT_JOB_STALE_AFTER', 15 * 60))
+    SUGGEST_CACHE_TTL = int(os.environ.get('SUGGEST_CACHE_TTL', 60))
+    READINESS_DB_TIMEOUT = float(os.environ.get('READINESS_DB_TIMEOUT', 2))
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+    CACHE_DIR = os.environ.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'cask-and-cup-cache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
 
 class DevelopmentConfig(BaseConfig):
     ENV_NAME = 'development'
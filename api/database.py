@@ -0,0 +1,33 @@
+"""Per-connection engine setup.
+
+SQLite settings such as busy_timeout and synchronous live on the
+connection, not in the database file, so they're applied to every new
+DBAPI connection the pool opens.
+"""
+from sqlalchemy import event
+
+
+def _sqlite_pragmas(config):
+    return [
+        f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+
+def init_engine(app, db):
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = _sqlite_pragmas(app.config)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
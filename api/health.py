@@ -0,0 +1,64 @@
+import threading
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+
+from .extensions import db
+
+health_bp = Blueprint('health', __name__, url_prefix='/api')
+
+# The migration scripts only change with a new image, so their head
+# revisions are read once per process.
+_expected_heads = None
+_heads_lock = threading.Lock()
+
+
+def _migration_heads():
+    global _expected_heads
+    with _heads_lock:
+        if _expected_heads is None:
+            directory = current_app.extensions['migrate'].directory
+            _expected_heads = frozenset(ScriptDirectory(directory).get_heads())
+        return _expected_heads
+
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the worker is up and serving requests. Touches nothing
+    else, so a slow or unavailable database never gets the pod restarted."""
+    return jsonify({"status": "ok"})
+
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: the database answers within READINESS_DB_TIMEOUT and is
+    migrated to the revision this code expects."""
+    timeout_ms = int(current_app.config['READINESS_DB_TIMEOUT'] * 1000)
+    try:
+        with db.engine.connect() as connection:
+            if connection.dialect.name == 'postgresql':
+                connection.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+            connection.execute(text("SELECT 1"))
+            current_heads = frozenset(MigrationContext.configure(connection).get_current_heads())
+    except Exception as e:
+        current_app.logger.warning("Readiness check failed: %s", e)
+        return jsonify({"status": "unavailable", "error": "database unreachable"}), 503
+
+    try:
+        expected_heads = _migration_heads()
+    except Exception as e:
+        # Not cached on failure, so the next probe reads the scripts again.
+        current_app.logger.warning("Readiness check failed: %s", e)
+        return jsonify({"status": "unavailable", "error": "migration scripts unreadable"}), 503
+
+    if current_heads != expected_heads:
+        return jsonify({
+            "status": "unavailable",
+            "error": "database schema is not at the expected migration",
+            "database": sorted(current_heads),
+            "expected": sorted(expected_heads),
+        }), 503
+
+    return jsonify({"status": "ok"})
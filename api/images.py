@@ -0,0 +1,291 @@
+import hashlib
+import io
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from flask import current_app
+from sqlalchemy import func, select, update
+
+from .extensions import db
+from .models import Beverage, BeverageImage, ImageFetch
+
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+ORIGINAL = 'original'
+
+# Derived variants and the longest edge (px) each is scaled down to. They're
+# re-encoded as WebP, which is typically a fraction of the size of the phone
+# JPEGs people upload.
+VARIANT_SIZES = {
+    'thumb': 160,
+    'medium': 800,
+}
+VARIANT_FORMAT = 'WEBP'
+VARIANT_CONTENT_TYPE = 'image/webp'
+VARIANT_QUALITY = 80
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+def _open_image(data):
+    """Image.open, refusing decompression bombs. Past MAX_IMAGE_PIXELS, where
+    Pillow only warns, the image is refused too. That check is made here
+    rather than by turning the warning into an error, because warning
+    filters are process-wide and images are also decoded on pool threads."""
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError("Image has too many pixels to process.") from e
+    if Image.MAX_IMAGE_PIXELS and image.width * image.height > Image.MAX_IMAGE_PIXELS:
+        image.close()
+        raise ImageTooLargeError("Image has too many pixels to process.")
+    return image
+
+
+def sniff_content_type(data, fallback=None):
+    """Best-effort MIME type from the image bytes themselves, falling back to
+    whatever the client or remote server claimed. Raises ImageTooLargeError
+    for decompression bombs."""
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with _open_image(data) as image:
+            if image.format and image.format in Image.MIME:
+                return Image.MIME[image.format]
+    except (UnidentifiedImageError, OSError):
+        pass
+    return fallback or DEFAULT_CONTENT_TYPE
+
+
+def render_variants(data) -> dict:
+    """Downscaled WebP renditions of `data`, keyed by variant name. Variants
+    the source is already smaller than are skipped (the original is served in
+    their place), as is anything Pillow can't decode. Raises
+    ImageTooLargeError for decompression bombs."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    largest = max(VARIANT_SIZES.values())
+    try:
+        with _open_image(data) as source:
+            # Lets the JPEG decoder skip straight to a reduced scale rather
+            # than decoding every pixel of a 12MP photo.
+            source.draft('RGB', (largest, largest))
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+
+            variants = {}
+            for name, bound in VARIANT_SIZES.items():
+                if max(image.size) <= bound:
+                    continue
+                resized = image.copy()
+                resized.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+                out = io.BytesIO()
+                resized.save(out, VARIANT_FORMAT, quality=VARIANT_QUALITY)
+                variants[name] = out.getvalue()
+            return variants
+    except (UnidentifiedImageError, OSError):
+        return {}
+
+
+def _store(beverage, variant, data, content_type):
+    etag = hashlib.sha256(data).hexdigest()
+    image = beverage.images.get(variant)
+    if image is None:
+        beverage.images[variant] = BeverageImage(
+            variant=variant, data=data, content_type=content_type, etag=etag, size=len(data)
+        )
+        return
+
+    image.data = data
+    image.content_type = content_type
+    image.etag = etag
+    image.size = len(data)
+
+
+def set_beverage_image(beverage, data, content_type=None):
+    """Attach (or replace) the stored image for `beverage`, along with its
+    downscaled variants. Each ETag is the SHA-256 of that variant's bytes, so
+    it only changes when the picture does. Raises ImageTooLargeError, with
+    nothing stored, for decompression bombs."""
+    renditions = {ORIGINAL: (data, sniff_content_type(data, content_type))}
+    for name, variant_data in render_variants(data).items():
+        renditions[name] = (variant_data, VARIANT_CONTENT_TYPE)
+
+    for stale in set(beverage.images) - set(renditions):
+        del beverage.images[stale]
+    for variant, (variant_data, variant_type) in renditions.items():
+        _store(beverage, variant, variant_data, variant_type)
+
+
+# Longest edge tried when decoding barcodes, smallest first. Most phone
+# photos decode at the first scale; larger ones (and finally the full
+# resolution, None) are only tried when that fails.
+SCAN_SCALES = (1024, 2048, None)
+
+
+def _scan_image(data, bound, roi):
+    from PIL import ImageOps
+
+    with _open_image(data) as source:
+        if bound:
+            source.draft('L', (bound, bound))
+        image = ImageOps.exif_transpose(source).convert('L')
+
+    if roi:
+        x, y, w, h = roi
+        width, height = image.size
+        image = image.crop((
+            round(x * width), round(y * height),
+            round((x + w) * width), round((y + h) * height),
+        ))
+    if bound:
+        image.thumbnail((bound, bound))
+    return image
+
+
+def decode_barcode(data, roi=None):
+    """Decode the first barcode in an uploaded photo, or None. The image is
+    normalized to grayscale, optionally cropped to `roi` (x, y, width,
+    height as fractions of the image), and tried at increasing scales only
+    as earlier ones fail. Raises ImageTooLargeError for decompression
+    bombs."""
+    from pyzbar.pyzbar import decode
+
+    tried = set()
+    for bound in SCAN_SCALES:
+        image = _scan_image(data, bound, roi)
+        if image.size in tried:
+            continue
+        tried.add(image.size)
+        decoded = decode(image)
+        if decoded:
+            return decoded[0].data.decode('utf-8')
+    return None
+
+
+class ImageFetchError(ValueError):
+    pass
+
+
+# requests.Session isn't documented as thread-safe, so each background
+# thread keeps its own, reusing pooled connections across downloads.
+_sessions = threading.local()
+
+
+def _http_session():
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        session.headers['User-Agent'] = 'cask-and-cup-image-fetcher'
+        _sessions.session = session
+    return session
+
+
+def download_image(url):
+    """Fetch `url` with a timeout and a hard size cap. Returns (bytes,
+    claimed content type); raises ImageFetchError on anything unusable."""
+    import requests
+
+    if urlparse(url).scheme not in ('http', 'https'):
+        raise ImageFetchError("Only http(s) image URLs are supported.")
+
+    max_bytes = current_app.config['IMAGE_FETCH_MAX_BYTES']
+    try:
+        with _http_session().get(url, stream=True, timeout=current_app.config['IMAGE_FETCH_TIMEOUT']) as response:
+            if response.status_code != 200:
+                raise ImageFetchError(f"Remote server answered {response.status_code}.")
+            if int(response.headers.get('Content-Length') or 0) > max_bytes:
+                raise ImageFetchError(f"Image is larger than {max_bytes} bytes.")
+
+            buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                buffer.write(chunk)
+                if buffer.tell() > max_bytes:
+                    raise ImageFetchError(f"Image is larger than {max_bytes} bytes.")
+            return buffer.getvalue(), response.headers.get('Content-Type')
+    except requests.RequestException as e:
+        raise ImageFetchError(str(e)) from e
+
+
+UNSETTLED_STATES = ('pending', 'running')
+STALE_FETCH_ERROR = 'This download stopped responding, probably because the server restarted. Please try again.'
+
+
+def _settle_fetch(fetch_id, from_state, **values) -> bool:
+    """Move the fetch on from `from_state`, stamping updated_at. A no-op
+    (returning False) once fail_stale_fetches has settled it, so a late
+    worker never overwrites what the client was already told."""
+    updated = db.session.execute(
+        update(ImageFetch)
+        .where(ImageFetch.id == fetch_id, ImageFetch.state == from_state)
+        .values(updated_at=func.now(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return bool(updated)
+
+
+def fail_stale_fetches():
+    """Fail unsettled fetches untouched for IMAGE_FETCH_STALE_AFTER seconds:
+    their worker died with its process (a restart or deploy), and they would
+    otherwise be polled forever."""
+    # Measured on the database's clock, the one that stamps updated_at.
+    cutoff = db.session.scalar(select(func.now())) - timedelta(
+        seconds=current_app.config['IMAGE_FETCH_STALE_AFTER']
+    )
+    stale = db.session.scalars(
+        select(ImageFetch.id)
+        .where(ImageFetch.state.in_(UNSETTLED_STATES), ImageFetch.updated_at < cutoff)
+    ).all()
+    if not stale:
+        return
+    db.session.execute(
+        update(ImageFetch)
+        .where(ImageFetch.id.in_(stale), ImageFetch.state.in_(UNSETTLED_STATES))
+        .values(state='failed', error=STALE_FETCH_ERROR, finished_at=datetime.now())
+    )
+    db.session.commit()
+    current_app.logger.warning("Failed stale image fetches %s", stale)
+
+
+def run_image_fetch(fetch_id):
+    fetch = db.session.get(ImageFetch, fetch_id)
+    if fetch is None or not _settle_fetch(fetch_id, 'pending', state='running'):
+        return
+
+    try:
+        data, content_type = download_image(fetch.url)
+        beverage = db.session.get(Beverage, fetch.beverage_id)
+        if beverage is None:
+            raise ImageFetchError("Beverage no longer exists.")
+        set_beverage_image(beverage, data, content_type)
+        # The image and the fetch's outcome land in one transaction: if the
+        # fetch was failed as stale meanwhile, the image is dropped with it.
+        settled = db.session.execute(
+            update(ImageFetch)
+            .where(ImageFetch.id == fetch_id, ImageFetch.state == 'running')
+            .values(state='succeeded', finished_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if settled:
+            db.session.commit()
+        else:
+            db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        _settle_fetch(fetch_id, 'running', state='failed', error=str(e), finished_at=datetime.now())
+
+
+def queue_image_fetch(beverage, url):
+    """Record a pending download for `beverage`. Once the caller commits,
+    hand it to the pool with `submit(run_image_fetch, fetch.id)`."""
+    fetch = ImageFetch(beverage=beverage, url=url)
+    db.session.add(fetch)
+    return fetch
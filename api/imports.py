@@ -1,12 +1,23 @@
-import io
-from datetime import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
 
 import openpyxl
-from flask import Blueprint, jsonify, request
-from flask_login import login_required
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import current_user, login_required
+from sqlalchemy import delete, func, insert, select, update
 
 from .extensions import db
-from .models import CiderDetails, Rating, User
+from .jobs import submit
+from .models import CiderDetails, ImportJob, ImportPreview, Rating, User, match_key
+from .search import index_beverages
+from .similarity import TrigramIndex
+from .stats import refresh_rating_stats
+from .suggest import invalidate_suggestions
+from .versioning import CATALOG, bump_version
 
 import_bp = Blueprint('imports', __name__, url_prefix='/api/imports')
 
@@ -27,6 +38,22 @@ COLUMNS = {
     'name': 11,
 }
 
+# Bump whenever parse_workbook's output changes shape or meaning, so cached
+# previews from the old parser are never reused.
+PREVIEW_FORMAT_VERSION = 3
+
+# How many sheet rows a background preview parses between progress updates.
+PARSE_PROGRESS_INTERVAL = 1000
+
+# How alike two "brand flavor" strings must be (1 - edit distance / length)
+# to be proposed as a merge, and how many proposals a preview row gets.
+MERGE_SIMILARITY_THRESHOLD = 0.85
+MERGE_CANDIDATE_LIMIT = 3
+
+# States of a job whose worker hasn't finished with it yet.
+UNSETTLED_STATES = ('pending', 'running')
+STALE_JOB_ERROR = 'This import stopped responding, probably because the server restarted. Please try again.'
+
 
 def _norm(value):
     return ' '.join(str(value).split()) if value not in (None, '') else ''
@@ -40,16 +67,54 @@ def _iso(value):
     return value.isoformat() if isinstance(value, datetime) else None
 
 
-def parse_workbook(file_stream):
-    wb = openpyxl.load_workbook(file_stream, data_only=True)
-    ws = wb.worksheets[0]
-    rows = list(ws.iter_rows(values_only=True))
+def _fingerprint(row) -> str:
+    """Stable hash of one sheet row's meaningful content, so the same
+    response in next month's (longer) export is recognised as imported."""
+    values = [
+        _iso(value) if isinstance(value, datetime) else _norm_key(value)
+        for value in (_cell(row, column) for column in COLUMNS)
+    ]
+    return hashlib.sha256(json.dumps(values).encode()).hexdigest()
+
+
+def _cell(row, column):
+    """Read-only worksheets trim trailing empty cells, so rows can be
+    shorter than the header."""
+    index = COLUMNS[column]
+    return row[index] if index < len(row) else None
+
 
+def parse_workbook(file_stream, on_progress=None):
+    """Parse the export into preview groups. The sheet is read in
+    openpyxl's read-only mode and consumed row by row, so memory grows with
+    the number of distinct beverages rather than with rows x columns.
+    `on_progress(rows_read, total_rows)` is called every
+    PARSE_PROGRESS_INTERVAL rows; the total comes from the sheet's declared
+    dimensions and may be None."""
+    wb = openpyxl.load_workbook(file_stream, read_only=True, data_only=True)
+    try:
+        sheet = wb.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        if on_progress:
+            rows = _reporting(rows, on_progress, sheet.max_row)
+        return _parse_rows(rows)
+    finally:
+        wb.close()
+
+
+def _reporting(rows, on_progress, total):
+    for count, row in enumerate(rows, 1):
+        if count % PARSE_PROGRESS_INTERVAL == 0:
+            on_progress(count, total)
+        yield row
+
+
+def _parse_rows(rows):
     empty_summary = {'total_rows': 0, 'beverage_count': 0, 'rating_count': 0, 'rows_without_rating': 0}
-    if not rows:
+    header = next(rows, None)
+    if header is None:
         return {'beverages': [], 'names': [], 'summary': empty_summary}
 
-    header = rows[0]
     brand_col = COLUMNS['brand']
     flavor_col = COLUMNS['flavor']
     if (
@@ -68,12 +133,12 @@ def parse_workbook(file_stream):
     rating_count = 0
     rows_without_rating = 0
 
-    for row in rows[1:]:
+    for row in rows:
         if row is None or not any(row):
             continue
 
-        brand = _norm(row[COLUMNS['brand']])
-        flavor = _norm(row[COLUMNS['flavor']])
+        brand = _norm(_cell(row, 'brand'))
+        flavor = _norm(_cell(row, 'flavor'))
         if not brand or not flavor:
             continue
         total_rows += 1
@@ -81,30 +146,31 @@ def parse_workbook(file_stream):
         key = (_norm_key(brand), _norm_key(flavor))
         group = groups.setdefault(key, {'brand': brand, 'name': flavor, 'ratings': []})
 
-        raw_name = _norm(row[COLUMNS['name']])
+        raw_name = _norm(_cell(row, 'name'))
         if raw_name:
             names.add(raw_name)
 
-        score = row[COLUMNS['rating']]
+        score = _cell(row, 'rating')
         if score is None:
             rows_without_rating += 1
             continue
 
-        consumption_method = _norm(row[COLUMNS['consumption_method']])
-        other_medium = _norm(row[COLUMNS['other_medium']])
+        consumption_method = _norm(_cell(row, 'consumption_method'))
+        other_medium = _norm(_cell(row, 'other_medium'))
         if consumption_method.lower().startswith('other') and other_medium:
             consumption_method = other_medium
 
-        tasted_at = row[COLUMNS['last_tasted']] or row[COLUMNS['timestamp']]
+        tasted_at = _cell(row, 'last_tasted') or _cell(row, 'timestamp')
 
         group['ratings'].append({
             'raw_name': raw_name or None,
             'score': int(score),
-            'comment': _norm(row[COLUMNS['comments']]) or None,
-            'purchase_location': _norm(row[COLUMNS['purchase_location']]) or None,
-            'consumption_location': _norm(row[COLUMNS['consumption_location']]) or None,
+            'comment': _norm(_cell(row, 'comments')) or None,
+            'purchase_location': _norm(_cell(row, 'purchase_location')) or None,
+            'consumption_location': _norm(_cell(row, 'consumption_location')) or None,
             'consumption_method': consumption_method or None,
             'tasted_at': _iso(tasted_at),
+            'fingerprint': _fingerprint(row),
         })
         rating_count += 1
 
@@ -122,6 +188,170 @@ def parse_workbook(file_stream):
     }
 
 
+def find_merge_candidates(groups) -> dict:
+    """Likely typos among the preview groups and against ciders already in
+    the catalog, keyed by preview row index like `apply_edits`' edits.
+    Within the preview, a near-identical pair is reported once, on the
+    spelling that looks less established: not already in the catalog, then
+    fewer ratings, then the later row. Exact matches are left out, since
+    those already merge (or reuse the existing cider) on commit."""
+    existing = db.session.execute(select(CiderDetails.id, CiderDetails.brand, CiderDetails.name)).all()
+    catalogued = {match_key(beverage.brand, beverage.name) for beverage in existing}
+
+    # Everything indexed, by index key: preview rows first, then ciders.
+    entries = [{'index': i, 'brand': group['brand'], 'name': group['name']} for i, group in enumerate(groups)]
+    entries += [{'beverage_id': beverage.id, 'brand': beverage.brand, 'name': beverage.name} for beverage in existing]
+    index = TrigramIndex()
+    for entry in entries:
+        index.add(f"{entry['brand']} {entry['name']}")
+
+    rank = [
+        (match_key(group['brand'], group['name']) in catalogued, len(group['ratings']), -i)
+        for i, group in enumerate(groups)
+    ]
+
+    candidates = {}
+    for i, group in enumerate(groups):
+        matches = []
+        spellings = set()
+        for key, score in index.search(
+            f"{group['brand']} {group['name']}",
+            MERGE_SIMILARITY_THRESHOLD,
+            limit=MERGE_CANDIDATE_LIMIT,
+            keep=lambda key: key >= len(groups) or rank[i] < rank[key],
+        ):
+            # A preview row and a catalogued cider can share a spelling;
+            # one proposal for it is enough.
+            spelling = match_key(entries[key]['brand'], entries[key]['name'])
+            if spelling not in spellings:
+                spellings.add(spelling)
+                matches.append({**entries[key], 'score': round(score, 3)})
+        if matches:
+            candidates[str(i)] = matches
+    return candidates
+
+
+def _preview_token(stream) -> str:
+    """Content hash of the upload (read in chunks, then rewound), salted
+    with the parser version so a parser change never serves stale groups."""
+    digest = hashlib.sha256(f'v{PREVIEW_FORMAT_VERSION}:'.encode())
+    for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _cached_preview(token):
+    """Return the cached parse for `token`, if any, dropping expired
+    previews along the way and extending the TTL of the one that hit."""
+    now = datetime.now()
+    db.session.execute(delete(ImportPreview).where(ImportPreview.expires_at < now))
+    preview = db.session.get(ImportPreview, token)
+    if preview:
+        preview.expires_at = now + timedelta(seconds=current_app.config['IMPORT_PREVIEW_TTL'])
+    db.session.commit()
+    return preview
+
+
+def _store_preview(token, result):
+    expires_at = datetime.now() + timedelta(seconds=current_app.config['IMPORT_PREVIEW_TTL'])
+    db.session.merge(ImportPreview(token=token, payload=result, expires_at=expires_at))
+    db.session.commit()
+
+
+def _spool_path(job_id) -> str:
+    """Where a preview job's upload waits for the worker to parse it."""
+    return os.path.join(tempfile.gettempdir(), f'cider-import-{job_id}.xlsx')
+
+
+def _remove_spool(job_id):
+    try:
+        os.unlink(_spool_path(job_id))
+    except FileNotFoundError:
+        pass
+
+
+def fail_stale_jobs():
+    """Fail unsettled jobs whose worker has gone quiet. Workers stamp
+    updated_at with every progress report, so a job untouched for
+    IMPORT_JOB_STALE_AFTER seconds died with its process (a restart or
+    deploy) and would otherwise be polled forever. Its spooled upload, if
+    it was left on this host, is removed too."""
+    # Measured on the database's clock, the one that stamps updated_at.
+    cutoff = db.session.scalar(select(func.now())) - timedelta(
+        seconds=current_app.config['IMPORT_JOB_STALE_AFTER']
+    )
+    stale = db.session.execute(
+        select(ImportJob.id, ImportJob.kind)
+        .where(ImportJob.state.in_(UNSETTLED_STATES), ImportJob.updated_at < cutoff)
+    ).all()
+    if not stale:
+        return
+    db.session.execute(
+        update(ImportJob)
+        .where(ImportJob.id.in_([job_id for job_id, _ in stale]), ImportJob.state.in_(UNSETTLED_STATES))
+        .values(state='failed', errors=[STALE_JOB_ERROR])
+    )
+    db.session.commit()
+    for job_id, kind in stale:
+        if kind == 'preview':
+            _remove_spool(job_id)
+    current_app.logger.warning("Failed stale import jobs %s", [job_id for job_id, _ in stale])
+
+
+class JobAbandoned(Exception):
+    """The job was settled elsewhere (failed as stale) while its worker was
+    still at it."""
+
+
+def _update_job(job_id, **values) -> bool:
+    """Write `values` to the job and stamp updated_at, the heartbeat
+    fail_stale_jobs goes by, but only while the job is unsettled: once it
+    has been failed as stale, the client has been told so and a late
+    worker must not overwrite that. Returns whether the write happened."""
+    updated = db.session.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.state.in_(UNSETTLED_STATES))
+        .values(updated_at=func.now(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return bool(updated)
+
+
+def _record_progress(job_id, **values):
+    """_update_job for a job in flight, stopping its worker if the job was
+    abandoned meanwhile."""
+    if not _update_job(job_id, **values):
+        raise JobAbandoned(job_id)
+
+
+def run_preview_job(job_id, token):
+    """Parse the job's spooled upload into the preview cache, recording
+    progress on the job. The spool file is removed either way."""
+    def report(rows_read, total_rows):
+        _record_progress(job_id, processed=rows_read, total=total_rows)
+
+    try:
+        if not _update_job(job_id, state='running'):
+            return
+        with open(_spool_path(job_id), 'rb') as stream:
+            result = parse_workbook(stream, report)
+        _record_progress(job_id)
+        result['merge_candidates'] = find_merge_candidates(result['beverages'])
+        _store_preview(token, result)
+        total_rows = result['summary']['total_rows']
+        _update_job(job_id, state='succeeded', processed=total_rows, total=total_rows, preview_token=token)
+    except Exception as e:
+        db.session.rollback()
+        _update_job(
+            job_id, state='failed',
+            errors=[str(e) if isinstance(e, ValueError) else f'Failed to parse spreadsheet: {e}'],
+        )
+    finally:
+        _remove_spool(job_id)
+
+
 @import_bp.route('/preview', methods=['POST'])
 @login_required
 def preview_import():
@@ -129,81 +359,258 @@ def preview_import():
     if not file or not file.filename:
         return jsonify({'message': 'No file uploaded.'}), 400
 
-    try:
-        result = parse_workbook(io.BytesIO(file.read()))
-    except ValueError as e:
-        return jsonify({'message': str(e)}), 400
-    except Exception as e:
-        return jsonify({'message': 'Failed to parse spreadsheet.', 'error': str(e)}), 400
+    # Werkzeug already spools uploads over 500KB to a temp file; hash
+    # straight from that stream rather than reading it into memory.
+    token = _preview_token(file.stream)
+    if preview := _cached_preview(token):
+        total_rows = preview.payload['summary']['total_rows']
+        job = ImportJob(
+            kind='preview', state='succeeded', preview_token=token,
+            processed=total_rows, total=total_rows, created_by=current_user.id,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return jsonify({'job': job.to_dict()}), 202
 
-    return jsonify(result)
+    job = ImportJob(kind='preview', created_by=current_user.id)
+    db.session.add(job)
+    db.session.commit()
 
+    # The request's own spool file is gone once we respond, so copy the
+    # upload somewhere the background job can still read it.
+    with open(_spool_path(job.id), 'wb') as spool:
+        shutil.copyfileobj(file.stream, spool)
+    submit(run_preview_job, job.id, token)
+    return jsonify({'job': job.to_dict()}), 202
 
-@import_bp.route('/commit', methods=['POST'])
+
+@import_bp.route('/previews/<token>', methods=['GET'])
 @login_required
-def commit_import():
-    data = request.json or {}
-    beverages_payload = data.get('beverages') or []
-    name_map = data.get('name_map') or {}
+def get_preview(token):
+    preview = db.session.get(ImportPreview, token)
+    if not preview or preview.expires_at < datetime.now():
+        return jsonify({'message': 'This preview has expired. Please upload the file again.'}), 410
+    return jsonify({'token': token, **preview.payload})
+
+
+def apply_edits(beverages, edits) -> list:
+    """Overlay client-side Brand/Name edits, keyed by preview row index,
+    onto the cached preview groups."""
+    edited = []
+    for index, group in enumerate(beverages):
+        change = edits.get(str(index)) or {}
+        edited.append({
+            **group,
+            'brand': change.get('brand', group['brand']),
+            'name': change.get('name', group['name']),
+        })
+    return edited
+
 
-    # Re-group by normalized brand/name in case the client edited text to
-    # merge two preview groups into one beverage.
+def merge_groups(beverages_payload) -> list:
+    """Re-group by normalized brand/name in case the client edited text to
+    merge two preview groups into one beverage."""
     merged = {}
     for group in beverages_payload:
         brand = _norm(group.get('brand'))
         name = _norm(group.get('name'))
         if not brand or not name:
             continue
-        key = (_norm_key(brand), _norm_key(name))
+        key = match_key(brand, name)
         target = merged.setdefault(key, {'brand': brand, 'name': name, 'ratings': []})
         target['ratings'].extend(group.get('ratings') or [])
+    return list(merged.values())
+
+
+def _rating_row(rating, beverage_id, user_id) -> dict:
+    row = {
+        'beverage_id': beverage_id,
+        'user_id': user_id,
+        'score': rating.get('score'),
+        'comment': rating.get('comment'),
+        'purchase_location': rating.get('purchase_location'),
+        'consumption_location': rating.get('consumption_location'),
+        'consumption_method': rating.get('consumption_method'),
+        'import_fingerprint': rating.get('fingerprint'),
+    }
+    # Left out entirely when unknown so the column's insert default applies,
+    # as it does for ORM-constructed ratings.
+    if rating.get('tasted_at'):
+        try:
+            row['created_at'] = datetime.fromisoformat(rating['tasted_at'])
+        except ValueError:
+            pass
+    return row
+
+
+def _existing_beverage_ids(keys) -> dict:
+    """Map match keys to already-catalogued ciders (the oldest one, should
+    the catalog itself hold duplicates)."""
+    found = {}
+    rows = db.session.execute(
+        select(CiderDetails.match_key, CiderDetails.id)
+        .where(CiderDetails.match_key.in_(keys))
+        .order_by(CiderDetails.id.desc())
+    )
+    for key, beverage_id in rows:
+        found[key] = beverage_id
+    return found
+
+
+def commit_groups(groups, name_map, chunk_size, on_progress=None) -> dict:
+    """Write preview groups to the catalog, committing every `chunk_size`
+    groups so no single transaction spans the whole log. Groups whose
+    brand/name match an existing cider reuse it, and ratings whose source
+    row was imported before (same fingerprint) are left alone, so
+    re-importing a grown log only writes the new rows. New ciders go in via
+    bulk INSERT ... RETURNING, ratings via executemany. Tasters are resolved
+    up front with one query. `on_progress(counts)` is called after each
+    committed chunk. A failure rolls back only the chunk in flight; earlier
+    chunks stay committed."""
+    mapped_ids = {int(user_id) for user_id in name_map.values() if user_id}
+    valid_user_ids = set(db.session.scalars(select(User.id).where(User.id.in_(mapped_ids)))) if mapped_ids else set()
+    user_for_name = {
+        raw_name: int(user_id)
+        for raw_name, user_id in name_map.items()
+        if user_id and int(user_id) in valid_user_ids
+    }
 
-    beverages_created = 0
-    ratings_created = 0
-    ratings_skipped = 0
-
-    try:
-        for group in merged.values():
-            beverage = CiderDetails(brand=group['brand'], name=group['name'])
-            db.session.add(beverage)
-            beverages_created += 1
+    counts = {
+        'groups_total': len(groups),
+        'groups_processed': 0,
+        'beverages_created': 0,
+        'beverages_matched': 0,
+        'ratings_created': 0,
+        'ratings_existing': 0,
+        'ratings_skipped': 0,
+    }
 
+    for start in range(0, len(groups), chunk_size):
+        chunk = groups[start:start + chunk_size]
+        keys = [match_key(group['brand'], group['name']) for group in chunk]
+        beverage_ids = _existing_beverage_ids(keys)
+        matched = len(beverage_ids)
+
+        new_groups = [(key, group) for key, group in zip(keys, chunk) if key not in beverage_ids]
+        created_ids = []
+        if new_groups:
+            created_ids = db.session.scalars(
+                insert(CiderDetails).returning(CiderDetails.id, sort_by_parameter_order=True),
+                [{'brand': group['brand'], 'name': group['name'], 'match_key': key} for key, group in new_groups],
+            ).all()
+            beverage_ids.update(zip((key for key, _ in new_groups), created_ids))
+
+        fingerprints = [
+            rating['fingerprint'] for group in chunk for rating in group['ratings'] if rating.get('fingerprint')
+        ]
+        seen = set(db.session.scalars(
+            select(Rating.import_fingerprint).where(Rating.import_fingerprint.in_(fingerprints))
+        )) if fingerprints else set()
+
+        rating_rows = []
+        existing = skipped = 0
+        for key, group in zip(keys, chunk):
             for rating in group['ratings']:
-                raw_name = rating.get('raw_name')
-                user_id = name_map.get(raw_name) if raw_name else None
-                user = db.session.get(User, user_id) if user_id else None
+                fingerprint = rating.get('fingerprint')
+                if fingerprint and fingerprint in seen:
+                    existing += 1
+                    continue
+                user_id = user_for_name.get(rating.get('raw_name'))
                 score = rating.get('score')
-
-                if not user or not score or not (1 <= score <= 5):
-                    ratings_skipped += 1
+                if not user_id or not score or not (1 <= score <= 5):
+                    skipped += 1
                     continue
-
-                created_at = None
-                if rating.get('tasted_at'):
-                    try:
-                        created_at = datetime.fromisoformat(rating['tasted_at'])
-                    except ValueError:
-                        created_at = None
-
-                db.session.add(Rating(
-                    beverage=beverage,
-                    user_id=user.id,
-                    score=score,
-                    comment=rating.get('comment'),
-                    purchase_location=rating.get('purchase_location'),
-                    consumption_location=rating.get('consumption_location'),
-                    consumption_method=rating.get('consumption_method'),
-                    created_at=created_at,
-                ))
-                ratings_created += 1
-
+                if fingerprint:
+                    seen.add(fingerprint)
+                rating_rows.append(_rating_row(rating, beverage_ids[key], user_id))
+
+        # Bulk statements bypass apply_rating_change and the flush hooks of
+        # the search index, suggestion cache and catalog version (which also
+        # retires cached payloads), so all are updated here.
+        rated_ids = {row['beverage_id'] for row in rating_rows}
+        if rating_rows:
+            db.session.execute(insert(Rating), rating_rows)
+            refresh_rating_stats(rated_ids)
+        index_beverages(rated_ids | set(created_ids))
+        if rated_ids or created_ids:
+            bump_version(CATALOG)
         db.session.commit()
+        if created_ids:
+            invalidate_suggestions()
+
+        counts['groups_processed'] += len(chunk)
+        counts['beverages_created'] += len(new_groups)
+        counts['beverages_matched'] += matched
+        counts['ratings_created'] += len(rating_rows)
+        counts['ratings_existing'] += existing
+        counts['ratings_skipped'] += skipped
+        if on_progress:
+            on_progress(dict(counts))
+
+    return counts
+
+
+def run_commit_job(job_id, edits, name_map):
+    """Write the job's cached preview to the catalog, recording progress on
+    the job after every committed chunk."""
+    job = db.session.get(ImportJob, job_id)
+    preview = db.session.get(ImportPreview, job.preview_token)
+    if preview is None:
+        _update_job(job_id, state='failed', errors=['This preview has expired. Please upload the file again.'])
+        return
+
+    groups = merge_groups(apply_edits(preview.payload['beverages'], edits))
+    if not _update_job(job_id, state='running', total=len(groups)):
+        return
+
+    def report(counts):
+        # Also the job's heartbeat, once per committed chunk.
+        _record_progress(
+            job_id,
+            processed=counts['groups_processed'],
+            beverages_created=counts['beverages_created'],
+            beverages_matched=counts['beverages_matched'],
+            ratings_created=counts['ratings_created'],
+            ratings_existing=counts['ratings_existing'],
+            ratings_skipped=counts['ratings_skipped'],
+        )
+        current_app.logger.info(
+            "Import job %d: %d/%d beverages, %d ratings committed",
+            job_id, counts['groups_processed'], counts['groups_total'], counts['ratings_created'],
+        )
+
+    try:
+        commit_groups(groups, name_map, current_app.config['IMPORT_CHUNK_SIZE'], report)
+        _update_job(job_id, state='succeeded')
     except Exception as e:
+        # Chunks committed before the failure stay imported; the job's
+        # counts still describe exactly what was written.
         db.session.rollback()
-        return jsonify({'message': 'Import failed.', 'error': str(e)}), 400
+        _update_job(job_id, state='failed', errors=[f'Import failed: {e}'])
 
-    return jsonify({
-        'beverages_created': beverages_created,
-        'ratings_created': ratings_created,
-        'ratings_skipped': ratings_skipped,
-    }), 201
+
+@import_bp.route('/commit', methods=['POST'])
+@login_required
+def commit_import():
+    data = request.json or {}
+    preview = db.session.get(ImportPreview, data.get('token') or '')
+    if not preview or preview.expires_at < datetime.now():
+        return jsonify({'message': 'This preview has expired. Please upload the file again.'}), 410
+
+    job = ImportJob(kind='commit', preview_token=preview.token, created_by=current_user.id)
+    db.session.add(job)
+    db.session.commit()
+    submit(run_commit_job, job.id, data.get('edits') or {}, data.get('name_map') or {})
+    return jsonify({'job': job.to_dict()}), 202
+
+
+@import_bp.route('/<int:job_id>', methods=['GET'])
+@login_required
+def get_import_job(job_id):
+    job = db.session.get(ImportJob, job_id)
+    if job is None:
+        return jsonify({'message': 'Import job not found'}), 404
+    if job.state in UNSETTLED_STATES:
+        fail_stale_jobs()
+        db.session.refresh(job)
+    return jsonify(job.to_dict())
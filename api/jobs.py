@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+# One small pool per gunicorn worker process, created on first use so the
+# master process never forks with live threads.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config['BACKGROUND_WORKERS'],
+                thread_name_prefix='background-job',
+            )
+        return _executor
+
+
+def submit(fn, *args, **kwargs):
+    """Run `fn(*args, **kwargs)` on the background pool inside a fresh app
+    context (and therefore its own database session). Job state that needs
+    to be visible across workers belongs in the database, not in the
+    returned future."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                app.logger.exception("Background job %s failed", fn.__name__)
+
+    return _get_executor(app).submit(run)
@@ -1,13 +1,13 @@
-import base64
 from datetime import datetime
+from operator import attrgetter
 from typing import Any, Optional
 
 from flask_login import UserMixin
-from sqlalchemy import func
+from sqlalchemy import Float, cast, event, func, select
 from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, attribute_keyed_dict, mapped_column
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .extensions import db
@@ -15,6 +15,25 @@ from .extensions import db
 JSON_VARIANT = JSONB().with_variant(sqlite.JSON(), 'sqlite')
 
 
+def match_key(brand, name) -> str:
+    """Case- and whitespace-insensitive identity of a (brand, name) pair,
+    stored on Beverage.match_key so imports can find existing beverages
+    with an indexed lookup."""
+    def norm(value):
+        return ' '.join(str(value or '').split()).lower()
+    return f'{norm(brand)}\x1f{norm(name)}'
+
+
+def _tuple_getter(fields):
+    """Like attrgetter(*fields), but always returns a tuple."""
+    if len(fields) > 1:
+        return attrgetter(*fields)
+    if fields:
+        getter = attrgetter(fields[0])
+        return lambda obj: (getter(obj),)
+    return lambda obj: ()
+
+
 class User(UserMixin, db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(unique=True, nullable=False)
@@ -43,7 +62,9 @@ class Beverage(db.Model):
     brand: Mapped[str]
     name: Mapped[str]
     description: Mapped[Optional[str]]
-    image = mapped_column(db.LargeBinary, nullable=True)
+    # Kept in sync with brand/name by the flush hooks below; bulk inserts
+    # have to set it themselves.
+    match_key: Mapped[Optional[str]] = mapped_column(index=True)
     created_at: Mapped[datetime] = mapped_column(
         insert_default=func.now(),
         default=None,
@@ -55,6 +76,16 @@ class Beverage(db.Model):
         back_populates='beverage',
         cascade="all, delete-orphan"
     )
+    images: Mapped[dict[str, "BeverageImage"]] = db.relationship(
+        back_populates='beverage',
+        cascade="all, delete-orphan",
+        collection_class=attribute_keyed_dict('variant'),
+    )
+    rating_stats: Mapped[Optional["BeverageRatingStats"]] = db.relationship(
+        back_populates='beverage',
+        cascade="all, delete-orphan",
+        lazy='joined',
+    )
 
     __mapper_args__ = {
         "polymorphic_on": "type",
@@ -62,15 +93,43 @@ class Beverage(db.Model):
     }
 
     @hybrid_property
-    def average_rating(self) -> float:
-        if self.ratings:
-            return sum(r.score for r in self.ratings) / len(self.ratings)
-        else:
-            return None
+    def average_rating(self) -> Optional[float]:
+        return self.rating_stats.average_rating if self.rating_stats else None
+
+    @average_rating.inplace.expression
+    @classmethod
+    def _average_rating_expression(cls):
+        return (
+            select(BeverageRatingStats.average_rating)
+            .where(BeverageRatingStats.beverage_id == cls.id)
+            .scalar_subquery()
+        )
+
+    @hybrid_property
+    def rating_count(self) -> int:
+        return self.rating_stats.rating_count if self.rating_stats else 0
+
+    @rating_count.inplace.expression
+    @classmethod
+    def _rating_count_expression(cls):
+        return func.coalesce(
+            select(BeverageRatingStats.rating_count)
+            .where(BeverageRatingStats.beverage_id == cls.id)
+            .scalar_subquery(),
+            0,
+        )
+
+    # Each subclass lists its type-specific fields; type_details() reads
+    # them through one attrgetter built per class rather than per call.
+    detail_fields = ()
+    _detail_values = staticmethod(_tuple_getter(()))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._detail_values = staticmethod(_tuple_getter(cls.detail_fields))
 
     def type_details(self) -> dict:
-        """Overridden by each subclass to return its own type-specific fields."""
-        return {}
+        return dict(zip(self.detail_fields, self._detail_values(self)))
 
     def to_summary_dict(self) -> dict:
         return {
@@ -83,43 +142,54 @@ class Beverage(db.Model):
                 for barcode in self.barcodes
             ],
             "average_rating": self.average_rating,
+            "rating_count": self.rating_count,
+            "thumbnail_url": self.image_url('thumb'),
         }
 
-    def to_detail_dict(self) -> dict:
-        image_base64 = None
-        if self.image:
-            image_base64 = base64.b64encode(self.image).decode('utf-8')
+    def image_url(self, variant='original') -> Optional[str]:
+        """Served by GET /api/beverages/<id>/image[/<variant>], which falls
+        back to the original when a variant wasn't generated. The version
+        parameter changes with the image bytes, so the URL itself is
+        cacheable forever."""
+        image = self.images.get(variant) or self.images.get('original')
+        if image is None:
+            return None
+        path = f"/api/beverages/{self.id}/image"
+        if variant != 'original':
+            path += f"/{variant}"
+        return f"{path}?v={image.etag[:16]}"
 
+    def to_detail_dict(self) -> dict:
         data = self.to_summary_dict()
         data.update({
             "description": self.description,
-            "image": image_base64,
-            "ratings": [
-                {
-                    "id": r.id,
-                    "score": r.score,
-                    "comment": r.comment,
-                    "attributes": r.attributes,
-                    "user_id": r.user_id,
-                    "taster": r.user.display_name or r.user.email,
-                    "created_at": r.created_at.isoformat() if r.created_at else None,
-                }
-                for r in self.ratings
-            ],
+            "image_url": self.image_url('medium'),
+            "original_image_url": self.image_url(),
+            "ratings": [r.to_dict() for r in self.ratings],
             "details": self.type_details(),
         })
         return data
 
 
+@event.listens_for(Beverage, 'before_insert', propagate=True)
+@event.listens_for(Beverage, 'before_update', propagate=True)
+def _set_match_key(mapper, connection, target):
+    target.match_key = match_key(target.brand, target.name)
+
+
+# Type filter plus the default listing order (brand, then id), so a page of
+# GET /api/beverages is an index range scan rather than a sort of the table.
+db.Index('ix_beverage_type_brand', Beverage.type, func.lower(Beverage.brand), Beverage.id)
+db.Index('ix_beverage_brand', func.lower(Beverage.brand), Beverage.id)
+
+
 class CiderDetails(Beverage):
     id: Mapped[int] = mapped_column(db.ForeignKey('beverage.id'), primary_key=True)
     abv: Mapped[Optional[float]]
     style: Mapped[Optional[str]]
 
     __mapper_args__ = {"polymorphic_identity": "cider"}
-
-    def type_details(self) -> dict:
-        return {"abv": self.abv, "style": self.style}
+    detail_fields = ("abv", "style")
 
 
 class WhiskeyDetails(Beverage):
@@ -130,14 +200,7 @@ class WhiskeyDetails(Beverage):
     batch_number: Mapped[Optional[str]]
 
     __mapper_args__ = {"polymorphic_identity": "whiskey"}
-
-    def type_details(self) -> dict:
-        return {
-            "abv": self.abv,
-            "style": self.style,
-            "year": self.year,
-            "batch_number": self.batch_number,
-        }
+    detail_fields = ("abv", "style", "year", "batch_number")
 
 
 class CoffeeDetails(Beverage):
@@ -148,14 +211,7 @@ class CoffeeDetails(Beverage):
     varietal: Mapped[Optional[str]]
 
     __mapper_args__ = {"polymorphic_identity": "coffee"}
-
-    def type_details(self) -> dict:
-        return {
-            "origin": self.origin,
-            "roast_level": self.roast_level,
-            "process": self.process,
-            "varietal": self.varietal,
-        }
+    detail_fields = ("origin", "roast_level", "process", "varietal")
 
 
 BEVERAGE_TYPES = {
@@ -169,7 +225,8 @@ class Barcode(db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     beverage_id: Mapped[int] = mapped_column(
         db.ForeignKey('beverage.id'),
-        nullable=False
+        nullable=False,
+        index=True
     )
     code: Mapped[str] = mapped_column(nullable=False, unique=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -197,6 +254,9 @@ class Rating(db.Model):
     consumption_location: Mapped[Optional[str]]
     consumption_method: Mapped[Optional[str]]
     attributes: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON_VARIANT, nullable=True)
+    # Hash of the spreadsheet row an imported rating came from, so
+    # re-importing the same log skips rows it has already seen.
+    import_fingerprint: Mapped[Optional[str]] = mapped_column(index=True, unique=True)
     created_at: Mapped[datetime] = mapped_column(
         insert_default=func.now(),
         default=None,
@@ -205,3 +265,198 @@ class Rating(db.Model):
 
     beverage: Mapped["Beverage"] = db.relationship(back_populates="ratings")
     user: Mapped["User"] = db.relationship(back_populates="ratings")
+
+    def to_dict(self) -> dict:
+        """Reads `user`, so load it with the rating (joinedload or
+        contains_eager) when serializing many."""
+        return {
+            "id": self.id,
+            "beverage_id": self.beverage_id,
+            "score": self.score,
+            "comment": self.comment,
+            "attributes": self.attributes,
+            "user_id": self.user_id,
+            "taster": self.user.display_name or self.user.email,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    __table_args__ = (
+        # A beverage's ratings; score is included so the min/max/sum
+        # aggregates in api/stats.py never touch the table.
+        db.Index('ix_rating_beverage_id_score', 'beverage_id', 'score'),
+        # A user's ratings, newest first, keyset-paged on (created_at, id).
+        db.Index('ix_rating_user_id_created_at', 'user_id', 'created_at', 'id'),
+        # Every rating since a point in time, keyset-paged the same way.
+        db.Index('ix_rating_created_at', 'created_at', 'id'),
+    )
+
+
+class BeverageImage(db.Model):
+    """Image bytes live apart from the beverage row so listing and detail
+    queries never drag blobs along; `data` is deferred until streamed. Each
+    beverage has an 'original' row plus any downscaled variants (see
+    api.images.VARIANT_SIZES)."""
+    beverage_id: Mapped[int] = mapped_column(
+        db.ForeignKey('beverage.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    variant: Mapped[str] = mapped_column(primary_key=True, default='original')
+    content_type: Mapped[str]
+    etag: Mapped[str]
+    size: Mapped[int]
+    data = mapped_column(db.LargeBinary, nullable=False, deferred=True)
+    created_at: Mapped[datetime] = mapped_column(
+        insert_default=func.now(),
+        onupdate=func.now(),
+        default=None,
+        nullable=True
+    )
+
+    beverage: Mapped["Beverage"] = db.relationship(back_populates="images")
+
+
+class ImageFetch(db.Model):
+    """A queued download of a beverage image from a remote URL. Rows are the
+    source of truth for status so any worker can answer a poll."""
+    id: Mapped[int] = mapped_column(primary_key=True)
+    beverage_id: Mapped[int] = mapped_column(
+        db.ForeignKey('beverage.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    url: Mapped[str]
+    state: Mapped[str] = mapped_column(default='pending')
+    error: Mapped[Optional[str]]
+    created_at: Mapped[datetime] = mapped_column(
+        insert_default=func.now(),
+        default=None,
+        nullable=True
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        insert_default=func.now(),
+        onupdate=func.now(),
+        default=None,
+    )
+    finished_at: Mapped[Optional[datetime]]
+
+    beverage: Mapped["Beverage"] = db.relationship()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "beverage_id": self.beverage_id,
+            "state": self.state,
+            "error": self.error,
+        }
+
+
+class ImportPreview(db.Model):
+    """A parsed import spreadsheet, keyed by a hash of its contents, so the
+    commit step (on whichever worker) only needs the token plus edits."""
+    token: Mapped[str] = mapped_column(primary_key=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON_VARIANT, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        insert_default=func.now(),
+        default=None,
+        nullable=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+
+class ImportJob(db.Model):
+    """Progress and outcome of a background import step ('preview' parses
+    an upload, 'commit' writes a preview to the catalog). Polled by the
+    client via GET /api/imports/<id>."""
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str]
+    state: Mapped[str] = mapped_column(default='pending')
+    processed: Mapped[int] = mapped_column(default=0)
+    total: Mapped[Optional[int]]
+    beverages_created: Mapped[int] = mapped_column(default=0)
+    beverages_matched: Mapped[int] = mapped_column(default=0)
+    ratings_created: Mapped[int] = mapped_column(default=0)
+    ratings_existing: Mapped[int] = mapped_column(default=0)
+    ratings_skipped: Mapped[int] = mapped_column(default=0)
+    errors: Mapped[list[str]] = mapped_column(JSON_VARIANT, default=list)
+    preview_token: Mapped[Optional[str]]
+    created_by: Mapped[Optional[int]] = mapped_column(db.ForeignKey('user.id'))
+    created_at: Mapped[datetime] = mapped_column(
+        insert_default=func.now(),
+        default=None,
+        nullable=True
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        insert_default=func.now(),
+        onupdate=func.now(),
+        default=None,
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "processed": self.processed,
+            "total": self.total,
+            "beverages_created": self.beverages_created,
+            "beverages_matched": self.beverages_matched,
+            "ratings_created": self.ratings_created,
+            "ratings_existing": self.ratings_existing,
+            "ratings_skipped": self.ratings_skipped,
+            "errors": self.errors or [],
+            "preview_token": self.preview_token,
+        }
+
+
+class DataVersion(db.Model):
+    """Counter bumped by every transaction that changes a dataset (e.g.
+    'catalog'), so readers can validate HTTP caches with one primary-key
+    lookup instead of recomputing their response."""
+    name: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        insert_default=func.now(),
+        default=None,
+        nullable=True
+    )
+
+
+class RatingStatsMixin:
+    """Running rating aggregates, maintained by api.stats as ratings are
+    written so reads never have to scan the rating table."""
+    rating_count: Mapped[int] = mapped_column(default=0)
+    score_sum: Mapped[int] = mapped_column(default=0)
+    score_min: Mapped[Optional[int]]
+    score_max: Mapped[Optional[int]]
+
+    @hybrid_property
+    def average_rating(self) -> Optional[float]:
+        if self.rating_count:
+            return self.score_sum / self.rating_count
+        return None
+
+    @average_rating.inplace.expression
+    @classmethod
+    def _average_rating_expression(cls):
+        return cast(cls.score_sum, Float) / func.nullif(cls.rating_count, 0)
+
+    def to_dict(self) -> dict:
+        return {
+            "rating_count": self.rating_count,
+            "average_rating": self.average_rating,
+            "score_min": self.score_min,
+            "score_max": self.score_max,
+        }
+
+
+class BeverageRatingStats(RatingStatsMixin, db.Model):
+    beverage_id: Mapped[int] = mapped_column(
+        db.ForeignKey('beverage.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    beverage: Mapped["Beverage"] = db.relationship(back_populates="rating_stats")
+
+
+class TypeRatingStats(RatingStatsMixin, db.Model):
+    type: Mapped[str] = mapped_column(primary_key=True)
@@ -1,13 +1,74 @@
-from flask import Blueprint, jsonify, request
+import base64
+import io
+import json
+import time
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request, send_file
 from flask_login import current_user, login_required
-from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import func, inspect as sa_inspect, literal, tuple_, type_coerce
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, joinedload, selectin_polymorphic, selectinload, with_polymorphic
 
+from .cache import DETAIL, SUMMARY, cache_stats, cached_payloads
 from .extensions import db
-from .models import BEVERAGE_TYPES, Barcode, Beverage, Rating
+from .images import (
+    ORIGINAL,
+    UNSETTLED_STATES,
+    VARIANT_SIZES,
+    ImageTooLargeError,
+    decode_barcode,
+    fail_stale_fetches,
+    queue_image_fetch,
+    run_image_fetch,
+    set_beverage_image,
+)
+from .jobs import submit
+from .models import (
+    BEVERAGE_TYPES,
+    Barcode,
+    Beverage,
+    BeverageImage,
+    BeverageRatingStats,
+    ImageFetch,
+    Rating,
+    TypeRatingStats,
+    User,
+)
+from .search import search_query
+from .serialization import STREAM_FORMATS, streamed_response
+from .stats import apply_rating_change, refresh_type_rating_stats
+from .suggest import SUGGEST_FIELDS, suggest
+from .versioning import CATALOG, conditional_on
 
 main_bp = Blueprint('main', __name__)
 
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+MAX_BARCODE_LOOKUP = 100
+# Beverages loaded per query while streaming a full listing.
+STREAM_BATCH_SIZE = 500
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+# Versioned image URLs (?v=<etag prefix>) never change content, so browsers
+# and proxies may keep them for a year; bare URLs must revalidate.
+IMAGE_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def _sort_columns():
+    """Sort keys accepted by GET /api/beverages, mapped to SQL expressions."""
+    return {
+        'brand': func.lower(Beverage.brand),
+        'name': func.lower(Beverage.name),
+        'type': Beverage.type,
+        'created_at': Beverage.created_at,
+        'average_rating': BeverageRatingStats.average_rating,
+    }
+
+
+def _bool_arg(value) -> bool:
+    return value.strip().lower() in {'1', 'true', 'yes', 'on'}
+
 
 def _type_field_types(model_class) -> dict:
     """Maps each column name local to a Beverage subclass's own table (i.e.
@@ -37,24 +98,202 @@ def _extract_detail_kwargs(model_class, data) -> dict:
     return kwargs
 
 
+def _load_summaries(beverage_ids) -> dict:
+    """Summary payloads for `beverage_ids` in a fixed number of queries:
+    rating stats are joined in, barcodes and image metadata each come from
+    one batched SELECT."""
+    beverages = (
+        Beverage.query
+        .filter(Beverage.id.in_(beverage_ids))
+        .options(selectinload(Beverage.barcodes), selectinload(Beverage.images))
+    )
+    return {beverage.id: beverage.to_summary_dict() for beverage in beverages}
+
+
+def _stream_summaries(beverage_ids):
+    for start in range(0, len(beverage_ids), STREAM_BATCH_SIZE):
+        batch = beverage_ids[start:start + STREAM_BATCH_SIZE]
+        summaries = cached_payloads(SUMMARY, batch, _load_summaries)
+        yield [summaries[beverage_id] for beverage_id in batch if beverage_id in summaries]
+
+
+def _polymorphic_beverages():
+    """(entity, loader options) for selecting beverages together with their
+    type-specific columns, as set by POLYMORPHIC_LOADING:
+
+    - 'selectin': base rows, then one SELECT per detail table present in
+      the result, however many rows there are;
+    - 'joined': a single SELECT outer-joining every detail table;
+    - 'lazy': base rows only; detail columns load per row on first access.
+
+    Summaries never read detail columns, so listings stick to plain
+    Beverage queries (a type filter is on beverage.type) and skip this."""
+    mode = current_app.config['POLYMORPHIC_LOADING']
+    subclasses = list(BEVERAGE_TYPES.values())
+    if mode == 'selectin':
+        return Beverage, [selectin_polymorphic(Beverage, subclasses)]
+    if mode == 'joined':
+        return with_polymorphic(Beverage, subclasses), []
+    if mode == 'lazy':
+        return Beverage, []
+    raise ValueError(f"Unknown POLYMORPHIC_LOADING '{mode}'.")
+
+
+def _load_details(beverage_ids) -> dict:
+    entity, options = _polymorphic_beverages()
+    beverages = db.session.scalars(
+        db.select(entity)
+        .where(entity.id.in_(beverage_ids))
+        .options(
+            *options,
+            selectinload(entity.barcodes),
+            selectinload(entity.images),
+            selectinload(entity.ratings).joinedload(Rating.user),
+        )
+    )
+    return {beverage.id: beverage.to_detail_dict() for beverage in beverages}
+
+
 @main_bp.route('/api/beverages/<int:beverage_id>', methods=['GET'])
+@conditional_on(CATALOG)
 def get_beverage_details(beverage_id):
-    beverage = Beverage.query.get(beverage_id)
-    if not beverage:
+    details = cached_payloads(DETAIL, [beverage_id], _load_details)
+    if beverage_id not in details:
         return jsonify({"message": "Beverage not found"}), 404
 
-    return jsonify(beverage.to_detail_dict())
+    return jsonify(details[beverage_id])
+
+
+@main_bp.route('/api/beverages/<int:beverage_id>/image', methods=['GET'], defaults={'variant': ORIGINAL})
+@main_bp.route('/api/beverages/<int:beverage_id>/image/<variant>', methods=['GET'])
+def get_beverage_image(beverage_id, variant):
+    if variant != ORIGINAL and variant not in VARIANT_SIZES:
+        return jsonify({"message": f"Unknown image variant '{variant}'."}), 404
+
+    # Small originals never get variants; serve the original in their place.
+    image = (
+        db.session.get(BeverageImage, (beverage_id, variant))
+        or db.session.get(BeverageImage, (beverage_id, ORIGINAL))
+    )
+    if not image:
+        return jsonify({"message": "Image not found"}), 404
+
+    # Answer revalidations before the deferred blob column is ever loaded.
+    if image.etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = send_file(
+            io.BytesIO(image.data),
+            mimetype=image.content_type,
+            last_modified=image.created_at,
+        )
+
+    response.set_etag(image.etag)
+    response.cache_control.public = True
+    if request.args.get('v') == image.etag[:16]:
+        response.cache_control.no_cache = None
+        response.cache_control.max_age = IMAGE_IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
 
 
 @main_bp.route('/api/beverages', methods=['GET'])
+@conditional_on(CATALOG)
 def get_beverages():
-    query = Beverage.query
+    """Paginated beverage listing. Filtering (type, q), sorting (sort, order)
+    and paging (page, limit) all happen in SQL so the response stays one page
+    regardless of catalog size. `q` goes through the full-text index (see
+    api/search.py) and enables sort=relevance, the default when searching.
+    The page query only selects ids; the summaries come from the payload
+    cache (api/cache.py), and misses are loaded in one batch.
+
+    With stream=ndjson|array, every match is streamed instead of one page
+    (page/limit are ignored), in batches of STREAM_BATCH_SIZE."""
+    query = Beverage.query.with_entities(Beverage.id).outerjoin(Beverage.rating_stats)
     beverage_type = request.args.get('type')
     if beverage_type:
-        query = query.filter_by(type=beverage_type)
+        query = query.filter(Beverage.type == beverage_type)
+
+    sort_columns = _sort_columns()
+    search = search_query(request.args.get('q') or '')
+    if search is not None:
+        query = query.join(search, search.c.beverage_id == Beverage.id)
+        sort_columns['relevance'] = search.c.rank
+
+    sort_key = request.args.get('sort', 'relevance' if search is not None else 'brand')
+    sort_column = sort_columns.get(sort_key)
+    if sort_column is None:
+        return jsonify({"message": f"Invalid sort key '{sort_key}'."}), 400
+    order = request.args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        return jsonify({"message": "Invalid sort order. Must be 'asc' or 'desc'."}), 400
+    sort_column = sort_column.desc() if order == 'desc' else sort_column.asc()
+    # Beverage.id breaks ties so paging is stable across requests.
+    query = query.order_by(sort_column.nulls_last(), Beverage.id)
+
+    if stream_format := request.args.get('stream'):
+        if stream_format not in STREAM_FORMATS:
+            return jsonify({"message": f"Invalid stream format. Must be one of: {', '.join(STREAM_FORMATS)}."}), 400
+        return streamed_response(_stream_summaries([row.id for row in query]), stream_format)
+
+    page = query.paginate(
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+        max_per_page=MAX_PAGE_SIZE,
+        error_out=False,
+    )
+    ids = [row.id for row in page.items]
+    summaries = cached_payloads(SUMMARY, ids, _load_summaries)
+    return jsonify({
+        "items": [summaries[beverage_id] for beverage_id in ids if beverage_id in summaries],
+        "total": page.total,
+        "page": page.page,
+        "limit": page.per_page,
+    })
+
+
+@main_bp.route('/api/search', methods=['GET'])
+@conditional_on(CATALOG)
+def search_beverages():
+    """Best matches for `q` across brand, name, description, barcodes and
+    rating comments, most relevant first. Optional `type` and `limit`."""
+    search = search_query(request.args.get('q') or '')
+    if search is None:
+        return jsonify({"items": []})
+
+    query = Beverage.query.with_entities(Beverage.id).join(search, search.c.beverage_id == Beverage.id)
+    if beverage_type := request.args.get('type'):
+        query = query.filter(Beverage.type == beverage_type)
+
+    limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    ids = [row.id for row in query.order_by(search.c.rank, Beverage.id).limit(limit)]
+    summaries = cached_payloads(SUMMARY, ids, _load_summaries)
+    return jsonify({"items": [summaries[beverage_id] for beverage_id in ids if beverage_id in summaries]})
+
+
+@main_bp.route('/api/beverages/suggest', methods=['GET'])
+def suggest_values():
+    """Autocomplete for the brand/name fields: distinct values starting with
+    `prefix`, most used first."""
+    field = request.args.get('field')
+    if field not in SUGGEST_FIELDS:
+        return jsonify({"message": f"Invalid field. Must be one of: {', '.join(SUGGEST_FIELDS)}."}), 400
+    limit = min(max(request.args.get('limit', DEFAULT_SUGGESTIONS, type=int), 1), MAX_SUGGESTIONS)
+    return jsonify({"items": suggest(field, (request.args.get('prefix') or '').strip(), limit)})
+
+
+@main_bp.route('/api/cache/stats', methods=['GET'])
+@login_required
+def get_cache_stats():
+    return jsonify(cache_stats())
+
 
-    beverages = query.all()
-    return jsonify([b.to_summary_dict() for b in beverages])
+@main_bp.route('/api/stats/types', methods=['GET'])
+@conditional_on(CATALOG)
+def get_type_stats():
+    return jsonify({row.type: row.to_dict() for row in TypeRatingStats.query.all()})
 
 
 @main_bp.route('/api/beverages', methods=['POST'])
@@ -66,32 +305,28 @@ def add_beverage():
     if not model_class:
         return jsonify({"message": "Invalid or missing beverage type."}), 400
 
-    image = None
-
-    # Handle image upload
-    if 'image' in request.files:
-        image_file = request.files['image']
-        if image_file:
-            image = image_file.read()
-
-    # Handle image URL
-    if 'image_url' in data and data['image_url']:
-        try:
-            import requests
-            response = requests.get(data['image_url'])
-            if response.status_code == 200:
-                image = response.content  # Download and store the image as binary data
-        except Exception as e:
-            return jsonify({"message": "Failed to fetch image from URL", "error": str(e)}), 400
-
     beverage = model_class(
         brand=data['brand'],
         name=data['name'],
         description=data.get('description'),
-        image=image,
         **_extract_detail_kwargs(model_class, data),
     )
 
+    # Handle image upload
+    if 'image' in request.files:
+        image_file = request.files['image']
+        if image_file:
+            try:
+                set_beverage_image(beverage, image_file.read(), image_file.mimetype)
+            except ImageTooLargeError as e:
+                return jsonify({"message": str(e)}), 400
+
+    # Image URLs are downloaded in the background so a slow remote host
+    # can't hold this worker.
+    image_fetch = None
+    if 'image_url' in data and data['image_url']:
+        image_fetch = queue_image_fetch(beverage, data['image_url'])
+
     db.session.add(beverage)
 
     if barcode := data.get('barcode'):
@@ -99,7 +334,14 @@ def add_beverage():
         db.session.add(new_barcode)
 
     db.session.commit()
-    return jsonify({"message": "Beverage added successfully!"}), 201
+    if image_fetch:
+        submit(run_image_fetch, image_fetch.id)
+
+    return jsonify({
+        "message": "Beverage added successfully!",
+        "id": beverage.id,
+        "image_fetch": image_fetch.to_dict() if image_fetch else None,
+    }), 201
 
 
 @main_bp.route('/api/beverages/<int:beverage_id>/ratings', methods=['POST'])
@@ -125,6 +367,7 @@ def add_rating(beverage_id):
         attributes=attributes,
     )
     db.session.add(rating)
+    apply_rating_change(beverage, added=[score])
     db.session.commit()
 
     return jsonify({"message": "Rating added successfully!"}), 201
@@ -140,9 +383,12 @@ def update_rating(rating_id):
     if not score or not (1 <= score <= 5):
         return jsonify({"message": "Invalid rating score. Must be between 1 and 5."}), 400
 
+    previous_score = rating.score
     rating.score = score
     rating.comment = data.get('comment', '')
     rating.attributes = data.get('attributes') or None
+    if score != previous_score:
+        apply_rating_change(rating.beverage, added=[score], removed=[previous_score])
     db.session.commit()
 
     return jsonify({"message": "Rating updated successfully!"}), 200
@@ -152,17 +398,120 @@ def update_rating(rating_id):
 @login_required
 def delete_rating(rating_id):
     rating = Rating.query.get_or_404(rating_id)
+    beverage = rating.beverage
     db.session.delete(rating)
+    apply_rating_change(beverage, removed=[rating.score])
     db.session.commit()
     return jsonify({"message": "Rating deleted successfully!"}), 200
 
 
+# rating.created_at exactly as stored. SQLite keeps timestamps as text, in
+# whichever format the writer used (CURRENT_TIMESTAMP has no fraction,
+# Python datetimes do), so cursors have to carry and compare that text
+# rather than a re-rendered datetime.
+_STORED_CREATED_AT = type_coerce(Rating.created_at, db.String)
+
+
+def _encode_cursor(created_at, rating_id) -> str:
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat(sep=' ')
+    raw = json.dumps([created_at, rating_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """(created_at, id) from a cursor made by _encode_cursor; raises
+    ValueError if it wasn't."""
+    try:
+        created_at, rating_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return str(created_at), int(rating_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def _rating_page(query, newest_first):
+    """One keyset page of `query` ordered on (created_at, id), continuing
+    after the `cursor` request arg. Each page is an index range scan plus
+    LIMIT, however deep into the history it is; tasters and beverages are
+    joined in the same query."""
+    key = tuple_(_STORED_CREATED_AT, Rating.id)
+    if cursor := request.args.get('cursor'):
+        created_at, rating_id = _decode_cursor(cursor)
+        after = tuple_(literal(created_at, db.String), rating_id)
+        query = query.filter(key < after if newest_first else key > after)
+    if newest_first:
+        query = query.order_by(Rating.created_at.desc(), Rating.id.desc())
+    else:
+        query = query.order_by(Rating.created_at, Rating.id)
+
+    limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    rows = (
+        query
+        .add_columns(_STORED_CREATED_AT)
+        .join(Rating.user)
+        .join(Rating.beverage)
+        .options(contains_eager(Rating.user), contains_eager(Rating.beverage))
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    ratings = [rating for rating, _ in rows]
+    return jsonify({
+        "items": [
+            {
+                **rating.to_dict(),
+                "beverage": {
+                    "id": rating.beverage.id,
+                    "type": rating.beverage.type,
+                    "brand": rating.beverage.brand,
+                    "name": rating.beverage.name,
+                },
+            }
+            for rating in ratings
+        ],
+        "next_cursor": _encode_cursor(rows[-1][1], ratings[-1].id) if has_more else None,
+    })
+
+
+@main_bp.route('/api/users/<int:user_id>/ratings', methods=['GET'])
+@login_required
+def get_user_ratings(user_id):
+    """A taster's ratings, newest first. Pass `next_cursor` back as
+    `cursor` for the following page."""
+    if not db.session.get(User, user_id):
+        return jsonify({"message": "User not found"}), 404
+    try:
+        return _rating_page(Rating.query.filter(Rating.user_id == user_id), newest_first=True)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+
+@main_bp.route('/api/ratings', methods=['GET'])
+@login_required
+def get_ratings():
+    """Every rating created after `since` (ISO 8601), oldest first, e.g. to
+    follow new activity. Paged the same way as a user's ratings."""
+    query = Rating.query
+    if since := request.args.get('since'):
+        try:
+            query = query.filter(Rating.created_at > datetime.fromisoformat(since))
+        except ValueError:
+            return jsonify({"message": "Invalid 'since' timestamp. Use ISO 8601."}), 400
+    try:
+        return _rating_page(query, newest_first=False)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+
 @main_bp.route('/api/beverages/<int:beverage_id>', methods=['DELETE'])
 @login_required
 def delete_beverage(beverage_id):
     beverage = Beverage.query.get(beverage_id)
     if beverage:
         db.session.delete(beverage)
+        db.session.flush()
+        refresh_type_rating_stats([beverage.type])
         db.session.commit()
         return jsonify({"message": "Beverage deleted successfully!"}), 200
     return jsonify({"message": "Beverage not found"}), 404
@@ -183,6 +532,45 @@ def add_barcode(beverage_id):
         return jsonify({"error": "This barcode already exists."}), 400
 
 
+def _lookup_barcodes(codes) -> dict:
+    """Resolve barcode codes to their beverages with one query against the
+    unique index on barcode.code (plus batched loads for the summaries'
+    barcodes and thumbnails)."""
+    barcodes = db.session.scalars(
+        db.select(Barcode)
+        .where(Barcode.code.in_(codes))
+        .options(
+            joinedload(Barcode.beverage).selectinload(Beverage.barcodes),
+            joinedload(Barcode.beverage).selectinload(Beverage.images),
+        )
+    ).all()
+    return {barcode.code: barcode.beverage for barcode in barcodes}
+
+
+@main_bp.route('/api/barcodes/<code>', methods=['GET'])
+def lookup_barcode(code):
+    beverage = _lookup_barcodes([code]).get(code)
+    if not beverage:
+        return jsonify({"message": "No beverage has that barcode"}), 404
+    return jsonify(beverage.to_summary_dict())
+
+
+@main_bp.route('/api/barcodes', methods=['GET'])
+def lookup_barcodes():
+    """Batch variant: /api/barcodes?code=A&code=B. Unknown codes map to null."""
+    codes = list(dict.fromkeys(request.args.getlist('code')))
+    if not codes:
+        return jsonify({"message": "Pass one or more 'code' parameters."}), 400
+    if len(codes) > MAX_BARCODE_LOOKUP:
+        return jsonify({"message": f"At most {MAX_BARCODE_LOOKUP} codes per lookup."}), 400
+
+    found = _lookup_barcodes(codes)
+    return jsonify({
+        code: found[code].to_summary_dict() if code in found else None
+        for code in codes
+    })
+
+
 @main_bp.route('/api/barcodes/<int:barcode_id>', methods=['DELETE'])
 @login_required
 def delete_barcode(barcode_id):
@@ -192,19 +580,56 @@ def delete_barcode(barcode_id):
     return jsonify({"message": "Barcode deleted successfully!"}), 200
 
 
+def _parse_roi(raw):
+    """'x,y,w,h' as fractions of the image, e.g. '0.25,0.4,0.5,0.2'."""
+    try:
+        x, y, w, h = (float(part) for part in raw.split(','))
+    except ValueError:
+        return None
+    if not (0 <= x < 1 and 0 <= y < 1 and 0 < w <= 1 - x and 0 < h <= 1 - y):
+        return None
+    return x, y, w, h
+
+
 @main_bp.route('/api/scan', methods=['POST'])
 @login_required
 def scan_barcode():
-    from pyzbar.pyzbar import decode
-    from PIL import Image
-    import io
-
-    file = request.files['image']
-    image = Image.open(io.BytesIO(file.read()))
-    decoded_objects = decode(image)
-    if decoded_objects:
-        return jsonify({"barcode": decoded_objects[0].data.decode('utf-8')})
-    return jsonify({"message": "No barcode detected"}), 400
+    """Decode a barcode from an uploaded photo. With resolve=1 the matching
+    beverage summary is looked up and returned in the same response."""
+    file = request.files.get('image')
+    if not file:
+        return jsonify({"message": "No image uploaded."}), 400
+
+    roi = None
+    if raw_roi := request.form.get('roi'):
+        roi = _parse_roi(raw_roi)
+        if roi is None:
+            return jsonify({"message": "Invalid roi. Expected 'x,y,w,h' as fractions of the image."}), 400
+
+    started = time.perf_counter()
+    try:
+        code = decode_barcode(file.read(), roi)
+    except ImageTooLargeError as e:
+        return jsonify({"message": str(e)}), 400
+    timings = {"decode_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    if not code:
+        response = jsonify({"message": "No barcode detected", "timings": timings})
+        response.status_code = 400
+    else:
+        payload = {"barcode": code}
+        if request.form.get('resolve', type=_bool_arg):
+            started = time.perf_counter()
+            beverage = _lookup_barcodes([code]).get(code)
+            payload["beverage"] = beverage.to_summary_dict() if beverage else None
+            timings["lookup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        payload["timings"] = timings
+        response = jsonify(payload)
+
+    response.headers['Server-Timing'] = ', '.join(
+        f"{name.removesuffix('_ms')};dur={value}" for name, value in timings.items()
+    )
+    return response
 
 
 @main_bp.route('/api/beverages/<int:beverage_id>', methods=['PUT'])
@@ -222,18 +647,17 @@ def update_beverage(beverage_id):
         setattr(beverage, field, value)
 
     # Handle image update
+    image_fetch = None
     if 'image' in request.files:
         image_file = request.files['image']
         if image_file:
-            beverage.image = image_file.read()
+            try:
+                set_beverage_image(beverage, image_file.read(), image_file.mimetype)
+            except ImageTooLargeError as e:
+                db.session.rollback()
+                return jsonify({"message": str(e)}), 400
     elif 'image_url' in data and data['image_url']:
-        try:
-            import requests
-            response = requests.get(data['image_url'])
-            if response.status_code == 200:
-                beverage.image = response.content
-        except Exception as e:
-            return jsonify({"message": "Failed to fetch image from URL", "error": str(e)}), 400
+        image_fetch = queue_image_fetch(beverage, data['image_url'])
 
     # Handle barcode update if provided
     if barcode := data.get('barcode'):
@@ -246,7 +670,26 @@ def update_beverage(beverage_id):
 
     try:
         db.session.commit()
-        return jsonify({"message": "Beverage updated successfully!"}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Failed to update beverage", "error": str(e)}), 400
+
+    if image_fetch:
+        submit(run_image_fetch, image_fetch.id)
+
+    return jsonify({
+        "message": "Beverage updated successfully!",
+        "image_fetch": image_fetch.to_dict() if image_fetch else None,
+    }), 200
+
+
+@main_bp.route('/api/image-fetches/<int:fetch_id>', methods=['GET'])
+@login_required
+def get_image_fetch(fetch_id):
+    fetch = db.session.get(ImageFetch, fetch_id)
+    if not fetch:
+        return jsonify({"message": "Image fetch not found"}), 404
+    if fetch.state in UNSETTLED_STATES:
+        fail_stale_fetches()
+        db.session.refresh(fetch)
+    return jsonify(fetch.to_dict())
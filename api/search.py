@@ -0,0 +1,137 @@
+"""Full-text search over beverages.
+
+Each beverage has one row in `beverage_search` holding the text worth
+searching: brand, name, description, its barcodes and its ratings'
+comments. On SQLite that table is an FTS5 virtual table keyed by rowid; on
+PostgreSQL it's a plain table with a weighted tsvector column (GIN) plus a
+pg_trgm index on "brand name" for typo-tolerant matches. Rows are refreshed
+for every beverage touched by a committed ORM write; bulk statements, which
+bypass the ORM, call `index_beverages` themselves.
+"""
+import re
+from itertools import chain
+
+import sqlalchemy as sa
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import Barcode, Beverage, Rating
+
+SEARCH_TABLE = 'beverage_search'
+
+# FTS5 bm25() column weights, in table column order: brand, name,
+# description, barcodes, comments.
+FTS_WEIGHTS = (10.0, 10.0, 2.0, 5.0, 1.0)
+
+_INDEX_CHUNK_SIZE = 500
+
+
+def _is_sqlite(session):
+    return session.get_bind().dialect.name == 'sqlite'
+
+
+def _table(session):
+    key = 'rowid' if _is_sqlite(session) else 'beverage_id'
+    return sa.table(
+        SEARCH_TABLE,
+        sa.column(key, sa.Integer()),
+        sa.column('brand'),
+        sa.column('name'),
+        sa.column('description'),
+        sa.column('barcodes'),
+        sa.column('comments'),
+    ), key
+
+
+def _documents(beverage_ids):
+    barcodes = (
+        select(func.aggregate_strings(Barcode.code, ' '))
+        .where(Barcode.beverage_id == Beverage.id)
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.aggregate_strings(Rating.comment, ' '))
+        .where(Rating.beverage_id == Beverage.id, Rating.comment.isnot(None))
+        .scalar_subquery()
+    )
+    return select(
+        Beverage.id,
+        Beverage.brand,
+        Beverage.name,
+        func.coalesce(Beverage.description, ''),
+        func.coalesce(barcodes, ''),
+        func.coalesce(comments, ''),
+    ).where(Beverage.id.in_(beverage_ids))
+
+
+def index_beverages(beverage_ids, session=None):
+    """Rewrite the search rows of `beverage_ids` from current data. Ids
+    that no longer exist simply lose their row."""
+    session = session or db.session
+    table, key = _table(session)
+    beverage_ids = sorted(beverage_ids)
+    for start in range(0, len(beverage_ids), _INDEX_CHUNK_SIZE):
+        chunk = beverage_ids[start:start + _INDEX_CHUNK_SIZE]
+        session.execute(table.delete().where(table.c[key].in_(chunk)))
+        session.execute(table.insert().from_select(
+            [key, 'brand', 'name', 'description', 'barcodes', 'comments'], _documents(chunk)
+        ))
+
+
+def rebuild_search_index(session=None):
+    session = session or db.session
+    table, _ = _table(session)
+    session.execute(table.delete())
+    index_beverages(session.scalars(select(Beverage.id)).all(), session)
+
+
+def _tokens(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def search_query(text):
+    """A subquery of (beverage_id, rank) for beverages matching every word
+    of `text` (each as a prefix), where a lower rank is a better match; or
+    None when `text` has nothing searchable in it."""
+    tokens = _tokens(text)
+    if not tokens:
+        return None
+
+    if _is_sqlite(db.session):
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        statement = sa.text(
+            f"SELECT rowid AS beverage_id, bm25({SEARCH_TABLE}, {weights}) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"
+        ).bindparams(match=' '.join(f'"{token}"*' for token in tokens))
+    else:
+        statement = sa.text(
+            "SELECT beverage_id, -(ts_rank(document, query) + similarity(brand || ' ' || name, :text)) AS rank "
+            f"FROM {SEARCH_TABLE}, to_tsquery('simple', :tsquery) AS query "
+            "WHERE document @@ query OR (brand || ' ' || name) % :text"
+        ).bindparams(text=' '.join(tokens), tsquery=' & '.join(f'{token}:*' for token in tokens))
+
+    return statement.columns(beverage_id=sa.Integer(), rank=sa.Float()).subquery('search')
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_search_changes(session, flush_context):
+    touched = session.info.setdefault('search_reindex', set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Beverage):
+            touched.add(obj.id)
+        elif isinstance(obj, (Barcode, Rating)) and obj.beverage_id is not None:
+            touched.add(obj.beverage_id)
+
+
+@event.listens_for(Session, 'before_commit')
+def _refresh_search_index(session):
+    session.flush()
+    touched = session.info.pop('search_reindex', None)
+    if touched:
+        index_beverages(touched, session)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_search_changes(session):
+    session.info.pop('search_reindex', None)
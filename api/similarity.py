@@ -0,0 +1,125 @@
+"""Near-duplicate lookup for short strings such as "brand flavor" pairs.
+
+Strings are indexed by their character trigrams. A query only probes the
+postings of its rarest few trigrams: if two strings are within edit
+distance d, each edit destroys at most three trigrams, so any match must
+share at least one of the query's 3d + 1 rarest ones. That keeps lookups
+far from pairwise, and every candidate is then confirmed with a banded
+edit-distance check.
+"""
+from collections import defaultdict
+
+# Keeps float rounding from turning e.g. 0.15 * 20 into a limit of 2.
+_EPSILON = 1e-9
+
+
+def normalize(text) -> str:
+    return ' '.join(str(text or '').split()).lower()
+
+
+def trigrams(text) -> set:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a, b, limit):
+    """Edit distance between `a` and `b`, or None once it must exceed
+    `limit`. Only the diagonal band of width 2 * limit + 1 is computed."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i, char in enumerate(a, 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char != b[j - 1]),
+            )
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class TrigramIndex:
+    """Append-only index of normalized strings, addressed by the position
+    they were added at."""
+
+    def __init__(self):
+        self._texts = []
+        self._grams = []
+        self._postings = defaultdict(list)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, text) -> int:
+        text = normalize(text)
+        key = len(self._texts)
+        grams = trigrams(text)
+        self._texts.append(text)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings[gram].append(key)
+        return key
+
+    def search(self, text, threshold=0.85, limit=None, keep=None) -> list:
+        """(key, similarity) for indexed strings whose similarity to `text`
+        (1 - edit distance / longer length) is at least `threshold`, best
+        first. Identical strings aren't reported. `keep(key)` can rule keys
+        out before they're compared; with `limit`, only the best `limit`
+        matches are returned, and candidates whose shared trigrams already
+        rule out beating those are never compared at all."""
+        text = normalize(text)
+        if not text:
+            return []
+        # Longest distance any match could be at: the other string may be
+        # longer than `text` by up to that distance itself.
+        max_distance = int((1 - threshold) * len(text) / threshold + _EPSILON)
+        grams = trigrams(text)
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+
+        candidates = set()
+        for gram in rarest[:3 * max_distance + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        # Cheap filters first (length, then shared trigrams), keeping a
+        # lower bound on each survivor's edit distance for ordering.
+        bounded = []
+        for key in candidates:
+            if keep is not None and not keep(key):
+                continue
+            other = self._texts[key]
+            longest = max(len(text), len(other))
+            allowed = int((1 - threshold) * longest + _EPSILON)
+            if abs(len(text) - len(other)) > allowed:
+                continue
+            missing = len(grams) - len(grams & self._grams[key])
+            lower = max(abs(len(text) - len(other)), -(-missing // 3), 1)
+            if lower <= allowed:
+                bounded.append((1 - lower / longest, key, longest))
+        bounded.sort(key=lambda item: (-item[0], item[1]))
+
+        matches = []
+        floor = threshold
+        for best_possible, key, longest in bounded:
+            if best_possible < floor:
+                break
+            distance = bounded_levenshtein(text, self._texts[key], int((1 - floor) * longest + _EPSILON))
+            if distance:
+                matches.append((key, 1 - distance / longest))
+                if limit and len(matches) >= limit:
+                    matches.sort(key=lambda match: (-match[1], match[0]))
+                    del matches[limit:]
+                    floor = max(floor, matches[-1][1])
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
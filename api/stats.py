@@ -0,0 +1,141 @@
+from sqlalchemy import case, delete, func, insert, inspect as sa_inspect, select
+
+from .extensions import db
+from .models import Beverage, BeverageRatingStats, Rating, TypeRatingStats
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+_REFRESH_CHUNK_SIZE = 500
+
+
+def _locked_stats(model, key, **defaults):
+    """Fetch (or create) a stats row, locking it for the rest of the
+    transaction on backends that support SELECT ... FOR UPDATE. The row is
+    usually already in the session (Beverage.rating_stats is joined-loaded),
+    so its attributes are overwritten from the locked read rather than
+    trusted as loaded."""
+    row = db.session.get(model, key, with_for_update=True, populate_existing=True)
+    if row is None:
+        row = model(rating_count=0, score_sum=0, **defaults)
+        db.session.add(row)
+    return row
+
+
+def _fold(row, added, removed) -> bool:
+    """Apply score deltas to a stats row. Returns True when a removed score
+    sat on the row's min or max, so the bounds must be recomputed.
+
+    Rows already in the database are updated relative to their current
+    values in SQL (SET rating_count = rating_count + n, ...), so concurrent
+    writers can't overwrite each other's increments even where the row
+    lock isn't available (SQLite)."""
+    bounds_stale = any(score in (row.score_min, row.score_max) for score in removed)
+    low, high = (min(added), max(added)) if added else (None, None)
+
+    if sa_inspect(row).pending:
+        row.rating_count += len(added) - len(removed)
+        row.score_sum += sum(added) - sum(removed)
+        if added and not bounds_stale:
+            row.score_min = low if row.score_min is None else min(row.score_min, low)
+            row.score_max = high if row.score_max is None else max(row.score_max, high)
+        return bounds_stale
+
+    model = type(row)
+    row.rating_count = model.rating_count + (len(added) - len(removed))
+    row.score_sum = model.score_sum + (sum(added) - sum(removed))
+    if added and not bounds_stale:
+        row.score_min = case((model.score_min.is_(None), low), (model.score_min > low, low), else_=model.score_min)
+        row.score_max = case((model.score_max.is_(None), high), (model.score_max < high, high), else_=model.score_max)
+    return bounds_stale
+
+
+def apply_rating_change(beverage, added=(), removed=()):
+    """Incrementally update the beverage and type aggregates for ratings
+    being added to and/or removed from `beverage` in the current
+    transaction. Only a removal that hits a min/max bound falls back to
+    re-reading, and then only that beverage's ratings."""
+    added, removed = list(added), list(removed)
+    if not added and not removed:
+        return
+
+    beverage_row = _locked_stats(BeverageRatingStats, beverage.id, beverage_id=beverage.id)
+    type_row = _locked_stats(TypeRatingStats, beverage.type, type=beverage.type)
+    beverage_bounds_stale = _fold(beverage_row, added, removed)
+    type_bounds_stale = _fold(type_row, added, removed)
+
+    if beverage_bounds_stale:
+        db.session.flush()
+        beverage_row.score_min, beverage_row.score_max = db.session.execute(
+            select(func.min(Rating.score), func.max(Rating.score))
+            .where(Rating.beverage_id == beverage.id)
+        ).one()
+    if type_bounds_stale:
+        db.session.flush()
+        type_row.score_min, type_row.score_max = db.session.execute(
+            select(func.min(BeverageRatingStats.score_min), func.max(BeverageRatingStats.score_max))
+            .join(Beverage, Beverage.id == BeverageRatingStats.beverage_id)
+            .where(Beverage.type == beverage.type)
+        ).one()
+
+
+def refresh_type_rating_stats(types=None):
+    """Recompute per-type aggregates from the per-beverage rows. `types`
+    limits the refresh; None rebuilds every type."""
+    aggregate = (
+        select(
+            Beverage.type,
+            func.sum(BeverageRatingStats.rating_count),
+            func.sum(BeverageRatingStats.score_sum),
+            func.min(BeverageRatingStats.score_min),
+            func.max(BeverageRatingStats.score_max),
+        )
+        .join(Beverage, Beverage.id == BeverageRatingStats.beverage_id)
+        .group_by(Beverage.type)
+    )
+    clear = delete(TypeRatingStats)
+    if types is not None:
+        types = list(types)
+        aggregate = aggregate.where(Beverage.type.in_(types))
+        clear = clear.where(TypeRatingStats.type.in_(types))
+
+    db.session.execute(clear)
+    db.session.execute(
+        insert(TypeRatingStats).from_select(
+            ['type', 'rating_count', 'score_sum', 'score_min', 'score_max'], aggregate
+        )
+    )
+
+
+def refresh_rating_stats(beverage_ids=None):
+    """Recompute aggregates from the rating table for `beverage_ids` (every
+    beverage when None) and the types they belong to. Used after bulk
+    writes that bypass apply_rating_change, and by `flask stats rebuild`."""
+    columns = ['beverage_id', 'rating_count', 'score_sum', 'score_min', 'score_max']
+    aggregate = select(
+        Rating.beverage_id,
+        func.count(Rating.id),
+        func.sum(Rating.score),
+        func.min(Rating.score),
+        func.max(Rating.score),
+    ).group_by(Rating.beverage_id)
+
+    if beverage_ids is None:
+        db.session.execute(delete(BeverageRatingStats))
+        db.session.execute(insert(BeverageRatingStats).from_select(columns, aggregate))
+        refresh_type_rating_stats()
+        return
+
+    beverage_ids = list(beverage_ids)
+    types = set()
+    for start in range(0, len(beverage_ids), _REFRESH_CHUNK_SIZE):
+        chunk = beverage_ids[start:start + _REFRESH_CHUNK_SIZE]
+        db.session.execute(delete(BeverageRatingStats).where(BeverageRatingStats.beverage_id.in_(chunk)))
+        db.session.execute(
+            insert(BeverageRatingStats).from_select(
+                columns, aggregate.where(Rating.beverage_id.in_(chunk))
+            )
+        )
+        types.update(db.session.scalars(
+            select(Beverage.type).where(Beverage.id.in_(chunk)).distinct()
+        ))
+    if types:
+        refresh_type_rating_stats(types)
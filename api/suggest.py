@@ -0,0 +1,105 @@
+"""Typeahead suggestions for the brand and name fields.
+
+Each worker keeps, per field, the distinct values with their usage counts
+in a list sorted by lowercased value. A prefix is then one pair of bisects
+into that list plus a top-k pick by count, with no query at all. Committed
+ORM writes to beverages drop the worker's copy; other workers catch up
+within SUGGEST_CACHE_TTL seconds.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from itertools import chain
+
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import Beverage
+
+SUGGEST_FIELDS = {
+    'brand': Beverage.brand,
+    'name': Beverage.name,
+}
+
+_lock = threading.Lock()
+# field -> (loaded_at, keys, entries): `keys` are the lowercased values in
+# sorted order and `entries[i]` is the (count, value) pair behind keys[i].
+_cache = {}
+# Bumped by every invalidation, so a load that raced one isn't kept.
+_generation = 0
+
+
+def _load(field):
+    column = SUGGEST_FIELDS[field]
+    rows = db.session.execute(select(column, func.count()).group_by(column)).all()
+
+    # Values differing only in case share a key; the most used spelling is
+    # the one suggested, carrying the combined count.
+    merged = {}
+    for value, count in rows:
+        if not value:
+            continue
+        key = value.lower()
+        total, best, best_count = merged.get(key, (0, value, 0))
+        if count > best_count:
+            best, best_count = value, count
+        merged[key] = (total + count, best, best_count)
+
+    keys = sorted(merged)
+    entries = [(merged[key][0], merged[key][1]) for key in keys]
+    return keys, entries
+
+
+def _snapshot(field):
+    ttl = current_app.config['SUGGEST_CACHE_TTL']
+    with _lock:
+        cached = _cache.get(field)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1], cached[2]
+        generation = _generation
+    keys, entries = _load(field)
+    with _lock:
+        if generation == _generation:
+            _cache[field] = (time.monotonic(), keys, entries)
+    return keys, entries
+
+
+def suggest(field, prefix, limit):
+    """Up to `limit` values of `field` starting with `prefix` (ignoring
+    case), most used first, then alphabetically."""
+    keys, entries = _snapshot(field)
+    prefix = prefix.lower()
+    start = bisect_left(keys, prefix)
+    # Every key with this prefix sorts before prefix + the highest code point.
+    end = bisect_left(keys, prefix + '\U0010ffff', start)
+    best = heapq.nsmallest(
+        limit, range(start, end), key=lambda i: (-entries[i][0], keys[i])
+    )
+    return [{'value': entries[i][1], 'count': entries[i][0]} for i in best]
+
+
+def invalidate_suggestions():
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_beverage_writes(session, flush_context):
+    if any(isinstance(obj, Beverage) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['suggest_stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _drop_stale_suggestions(session):
+    if session.info.pop('suggest_stale', False):
+        invalidate_suggestions()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_beverage_writes(session):
+    session.info.pop('suggest_stale', None)
@@ -0,0 +1,88 @@
+"""Change counters behind the ETag / Last-Modified headers of catalog reads.
+
+Any transaction that flushes a change to a beverage, its barcodes, images or
+ratings bumps the 'catalog' row of DataVersion once, inside that same
+transaction. Bulk statements bypass the ORM and call `bump_version`
+themselves. A read endpoint wrapped in `conditional_on(CATALOG)` first
+compares the client's validators against the current counter and answers
+304 without running the view (no catalog queries, no JSON encoding) when
+nothing has changed.
+"""
+from functools import wraps
+from itertools import chain
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import Barcode, Beverage, BeverageImage, DataVersion, Rating
+
+CATALOG = 'catalog'
+
+_CATALOG_MODELS = (Beverage, Barcode, BeverageImage, Rating)
+
+
+def bump_version(name, session=None):
+    session = session or db.session
+    session.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1, updated_at=func.now())
+    )
+    if has_app_context():
+        g.pop('data_versions', None)
+
+
+def current_version(name):
+    """(version, updated_at) of dataset `name`, or None if it isn't tracked.
+    Looked up once per app context (i.e. per request)."""
+    versions = g.setdefault('data_versions', {})
+    if name not in versions:
+        versions[name] = db.session.execute(
+            select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == name)
+        ).one_or_none()
+    return versions[name]
+
+
+def conditional_on(name):
+    """Give a GET view a weak ETag and Last-Modified derived from dataset
+    `name`'s counter, and short-circuit to 304 when the client's copy is
+    current. Only successful responses carry the validators."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = current_version(name)
+            if current is None:
+                return view(*args, **kwargs)
+
+            def validate(response):
+                response.set_etag(f'{name}-{current.version}', weak=True)
+                response.last_modified = current.updated_at
+                response.cache_control.no_cache = True
+                return response
+
+            probe = validate(current_app.response_class())
+            probe.make_conditional(request)
+            if probe.status_code == 304:
+                return probe
+
+            response = current_app.make_response(view(*args, **kwargs))
+            return validate(response) if response.status_code == 200 else response
+        return wrapper
+    return decorator
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_catalog_version(session, flush_context):
+    if session.info.get('catalog_bumped'):
+        return
+    if any(isinstance(obj, _CATALOG_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        bump_version(CATALOG, session)
+        session.info['catalog_bumped'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _reset_catalog_bump(session):
+    session.info.pop('catalog_bumped', None)
@@ -0,0 +1,14 @@
+import axios from "../axios";
+
+// Resolves a scanned code to its beverage summary, or null if none has it.
+export async function lookupBarcode(code) {
+  try {
+    const response = await axios.get(`/api/barcodes/${encodeURIComponent(code)}`);
+    return response.data;
+  } catch (error) {
+    if (error.response && error.response.status === 404) {
+      return null;
+    }
+    throw error;
+  }
+}
@@ -0,0 +1,17 @@
+import axios from "../axios";
+
+const POLL_INTERVAL_MS = 1000;
+const MAX_POLLS = 30;
+
+// Image URLs are downloaded server-side in the background; poll until the
+// fetch settles (or we give up) and return its final status.
+export async function waitForImageFetch(fetchId) {
+  for (let i = 0; i < MAX_POLLS; i++) {
+    const response = await axios.get(`/api/image-fetches/${fetchId}`);
+    if (response.data.state === "succeeded" || response.data.state === "failed") {
+      return response.data;
+    }
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+  }
+  return null;
+}
@@ -1,18 +1,55 @@
 import axios from "../axios";
 
+const POLL_INTERVAL_MS = 1000;
+// Give up on a job that has shown no progress for this long. The server
+// already fails jobs whose worker went quiet (IMPORT_JOB_STALE_AFTER, 15
+// minutes by default), so this is only a backstop.
+const STALL_TIMEOUT_MS = 20 * 60 * 1000;
+
+// Both steps run as background jobs on the server; these return the job,
+// which `waitForImportJob` then polls to completion.
 export async function previewImport(file) {
   const formData = new FormData();
   formData.append("file", file);
   const response = await axios.post("/api/imports/preview", formData, {
     headers: { "Content-Type": "multipart/form-data" },
   });
+  return response.data.job;
+}
+
+export async function fetchImportPreview(token) {
+  const response = await axios.get(`/api/imports/previews/${token}`);
   return response.data;
 }
 
-export async function commitImport(beverages, nameMap) {
+// The parsed preview stays cached server-side under `token`; only the
+// Brand/Name edits (keyed by preview row index) travel back on commit.
+export async function commitImport(token, edits, nameMap) {
   const response = await axios.post("/api/imports/commit", {
-    beverages,
+    token,
+    edits,
     name_map: nameMap,
   });
-  return response.data;
+  return response.data.job;
+}
+
+// Poll an import job until it settles, reporting each intermediate state
+// through `onProgress`. Large logs can take a while, so there's no overall
+// cap, but a job that stops progressing for STALL_TIMEOUT_MS is reported
+// as failed rather than polled forever.
+export async function waitForImportJob(job, onProgress) {
+  let progressedAt = Date.now();
+  while (job.state !== "succeeded" && job.state !== "failed") {
+    if (Date.now() - progressedAt > STALL_TIMEOUT_MS) {
+      return { ...job, state: "failed", errors: ["The import stopped responding. Please try again."] };
+    }
+    if (onProgress) onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    const response = await axios.get(`/api/imports/${job.id}`);
+    if (response.data.state !== job.state || response.data.processed !== job.processed) {
+      progressedAt = Date.now();
+    }
+    job = response.data;
+  }
+  return job;
 }
@@ -0,0 +1,9 @@
+import axios from "../axios";
+
+// Distinct brand/name values starting with `prefix`, most used first.
+export async function suggestValues(field, prefix) {
+  const response = await axios.get("/api/beverages/suggest", {
+    params: { field, prefix },
+  });
+  return response.data.items.map((item) => item.value);
+}
@@ -0,0 +1,31 @@
+"""backfill rating.created_at so ratings can be keyset-paged on (created_at, id)
+
+Revision ID: 65c8a94fdf75
+Revises: 5aced4dc977d
+Create Date: 2026-10-18 16:52:07.318420
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '65c8a94fdf75'
+down_revision = '5aced4dc977d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows without a timestamp would drop out of every rating timeline. The
+    # beverage's creation time is the closest known bound.
+    op.execute(
+        "UPDATE rating SET created_at = COALESCE("
+        "(SELECT beverage.created_at FROM beverage WHERE beverage.id = rating.beverage_id), "
+        "CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    )
+
+
+def downgrade():
+    # The backfilled values can't be told apart from real ones; keep them.
+    pass
@@ -0,0 +1,56 @@
+"""beverage image variants: key beverage_image by (beverage_id, variant)
+
+Revision ID: 7db96aa75f24
+Revises: a5981415f040
+Create Date: 2026-10-18 10:47:33.120871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7db96aa75f24'
+down_revision = 'a5981415f040'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['beverage_id', 'content_type', 'etag', 'size', 'data', 'created_at']
+
+
+def _rebuild_table(primary_key, copy_columns, variant_column=None):
+    """Recreate beverage_image with a different primary key (SQLite can't
+    alter one in place), copying rows across."""
+    columns = [
+        sa.Column('beverage_id', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    ]
+    if variant_column is not None:
+        columns.insert(1, variant_column)
+    op.create_table('_beverage_image_new', *columns,
+    sa.ForeignKeyConstraint(['beverage_id'], ['beverage.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint(*primary_key, name='pk_beverage_image')
+    )
+    column_list = ', '.join(copy_columns)
+    op.execute(f"INSERT INTO _beverage_image_new ({column_list}) SELECT {column_list} FROM beverage_image")
+    op.drop_table('beverage_image')
+    op.rename_table('_beverage_image_new', 'beverage_image')
+
+
+def upgrade():
+    # Existing rows are all originals; run `flask images variants` afterwards
+    # to generate their downscaled renditions.
+    _rebuild_table(
+        ['beverage_id', 'variant'],
+        COLUMNS,
+        sa.Column('variant', sa.String(), nullable=False, server_default='original'),
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM beverage_image WHERE variant != 'original'")
+    _rebuild_table(['beverage_id'], COLUMNS)
@@ -0,0 +1,76 @@
+"""beverage_search: full-text index (FTS5 on SQLite, tsvector + pg_trgm on PostgreSQL)
+
+Revision ID: 8e4d1a6b75f8
+Revises: c2d1d8720140
+Create Date: 2026-10-18 14:32:50.906114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d1a6b75f8'
+down_revision = 'c2d1d8720140'
+branch_labels = None
+depends_on = None
+
+# Kept in sync with api/search.py by hand; autogenerate doesn't see either
+# variant of this table.
+DOCUMENT = (
+    "setweight(to_tsvector('simple', brand), 'A') || "
+    "setweight(to_tsvector('simple', name), 'A') || "
+    "setweight(to_tsvector('simple', barcodes), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C') || "
+    "setweight(to_tsvector('simple', comments), 'D')"
+)
+
+BACKFILL = (
+    "SELECT beverage.id, beverage.brand, beverage.name, COALESCE(beverage.description, ''), "
+    "COALESCE((SELECT {agg} FROM barcode WHERE barcode.beverage_id = beverage.id), ''), "
+    "COALESCE((SELECT {comment_agg} FROM rating "
+    "WHERE rating.beverage_id = beverage.id AND rating.comment IS NOT NULL), '') "
+    "FROM beverage"
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE beverage_search USING fts5("
+            "brand, name, description, barcodes, comments, "
+            "prefix='2 3', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO beverage_search (rowid, brand, name, description, barcodes, comments) "
+            + BACKFILL.format(agg="group_concat(code, ' ')", comment_agg="group_concat(comment, ' ')")
+        )
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table('beverage_search',
+    sa.Column('beverage_id', sa.Integer(), nullable=False),
+    sa.Column('brand', sa.Text(), nullable=False),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('barcodes', sa.Text(), nullable=False),
+    sa.Column('comments', sa.Text(), nullable=False),
+    sa.Column('document', postgresql.TSVECTOR(), sa.Computed(DOCUMENT, persisted=True)),
+    sa.ForeignKeyConstraint(['beverage_id'], ['beverage.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('beverage_id')
+    )
+    op.create_index('ix_beverage_search_document', 'beverage_search', ['document'], postgresql_using='gin')
+    op.execute(
+        "CREATE INDEX ix_beverage_search_label_trgm ON beverage_search "
+        "USING gin ((brand || ' ' || name) gin_trgm_ops)"
+    )
+    op.execute(
+        "INSERT INTO beverage_search (beverage_id, brand, name, description, barcodes, comments) "
+        + BACKFILL.format(agg="string_agg(code, ' ')", comment_agg="string_agg(comment, ' ')")
+    )
+
+
+def downgrade():
+    # pg_trgm is left installed; other objects may have come to rely on it.
+    op.drop_table('beverage_search')
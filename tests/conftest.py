@@ -0,0 +1,80 @@
+import itertools
+import os
+from pathlib import Path
+
+# Settings are read when api.config is imported, so these must come first.
+# Each app gets its own in-memory database; the payload cache is off so
+# tests see the queries a cache miss would run.
+os.environ['FLASK_DB_URI'] = 'sqlite://'
+os.environ['CACHE_BACKEND'] = 'null'
+os.environ.setdefault('APP_ENV', 'development')
+
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event
+
+from api.app import create_app
+from api.extensions import db
+from api.models import Barcode, CiderDetails, Rating, User
+from api.stats import refresh_rating_stats
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / 'migrations'
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        upgrade(directory=str(MIGRATIONS))
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def user(app):
+    user = User(email='taster@example.com', display_name='Taster')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'email': user.email, 'password': 'password'})
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+def add_ciders(user):
+    """Add `count` more ciders, each with a barcode and two ratings. The
+    ratings bypass apply_rating_change, so the stats are rebuilt after."""
+    numbers = itertools.count()
+
+    def add(count):
+        for i in itertools.islice(numbers, count):
+            cider = CiderDetails(brand=f'Brand {i:03}', name=f'Cider {i:03}', abv=5.0)
+            cider.barcodes.append(Barcode(code=f'0000{i:08}'))
+            cider.ratings.extend([Rating(user=user, score=4), Rating(user=user, score=2)])
+            db.session.add(cider)
+        db.session.flush()
+        refresh_rating_stats()
+        db.session.commit()
+    return add
+
+
+@pytest.fixture
+def statements(app):
+    """(statement, parameters) of every SQL statement executed while the
+    test runs, in order."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', record)
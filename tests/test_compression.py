@@ -0,0 +1,30 @@
+import gzip
+
+import brotli
+import pytest
+
+from api.compression import _compress
+
+DECOMPRESS = {'gzip': gzip.decompress, 'br': brotli.decompress}
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br'])
+@pytest.mark.parametrize('stream_format', ['ndjson', 'array'])
+def test_streamed_listing_compresses_about_as_well_as_one_pass(app, client, add_ciders, encoding, stream_format):
+    add_ciders(1200)
+    url = f'/api/beverages?stream={stream_format}'
+    identity = client.get(url).get_data()
+
+    response = client.get(url, headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    streamed = response.get_data()
+    assert DECOMPRESS[encoding](streamed) == identity
+    # Only the flushes at batch boundaries cost anything over compressing
+    # the whole document at once.
+    assert len(streamed) <= len(_compress(identity, encoding, app.config)) * 1.05
+
+
+def test_short_streamed_listing_is_not_compressed(client):
+    response = client.get('/api/beverages?stream=array', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == b'[]\n'
@@ -0,0 +1,15 @@
+from api import health
+
+
+def test_readyz_when_migrated(client):
+    response = client.get('/api/readyz')
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok'}
+
+
+def test_readyz_when_migration_scripts_are_unreadable(app, client, monkeypatch):
+    monkeypatch.setattr(health, '_expected_heads', None)
+    monkeypatch.setattr(app.extensions['migrate'], 'directory', '/nonexistent/migrations')
+    response = client.get('/api/readyz')
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'migration scripts unreadable'
@@ -0,0 +1,47 @@
+from sqlalchemy import text
+
+from api import images
+from api.extensions import db
+from api.images import STALE_FETCH_ERROR, run_image_fetch
+from api.models import CiderDetails, ImageFetch
+
+
+def _queue_fetch(state='pending'):
+    fetch = ImageFetch(beverage=CiderDetails(brand='Brand', name='Cider'), url='https://example.com/a.jpg', state=state)
+    db.session.add(fetch)
+    db.session.commit()
+    return fetch.id
+
+
+def _go_quiet(fetch_id):
+    db.session.execute(
+        text("UPDATE image_fetch SET updated_at = datetime('now', '-1 hour') WHERE id = :id"), {'id': fetch_id}
+    )
+    db.session.commit()
+
+
+def test_poll_fails_a_fetch_whose_worker_died(client):
+    quiet, busy = _queue_fetch('running'), _queue_fetch('running')
+    _go_quiet(quiet)
+
+    assert client.get(f'/api/image-fetches/{quiet}').get_json() == {
+        'id': quiet, 'beverage_id': 1, 'state': 'failed', 'error': STALE_FETCH_ERROR,
+    }
+    assert client.get(f'/api/image-fetches/{busy}').get_json()['state'] == 'running'
+
+
+def test_worker_does_not_overwrite_a_fetch_failed_as_stale(client, monkeypatch):
+    fetch_id = _queue_fetch()
+
+    def slow_download(url):
+        _go_quiet(fetch_id)
+        assert client.get(f'/api/image-fetches/{fetch_id}').get_json()['state'] == 'failed'
+        raise images.ImageFetchError('Remote server answered 500.')
+
+    monkeypatch.setattr(images, 'download_image', slow_download)
+    run_image_fetch(fetch_id)
+
+    fetch = db.session.get(ImageFetch, fetch_id)
+    db.session.refresh(fetch)
+    assert fetch.state == 'failed'
+    assert fetch.error == STALE_FETCH_ERROR
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+from PIL import Image
+
+from api import images
+from api.extensions import db
+from api.images import run_image_fetch
+from api.models import Beverage, CiderDetails, ImageFetch
+
+
+def _png(side):
+    out = io.BytesIO()
+    Image.new('RGB', (side, side)).save(out, 'PNG')
+    return out.getvalue()
+
+
+# With MAX_IMAGE_PIXELS at 1000, Pillow itself refuses a 50x50 image; a
+# 40x40 one only makes it warn.
+BOMBS = pytest.mark.parametrize('side', [50, 40])
+
+
+@pytest.fixture(autouse=True)
+def low_pixel_limit(monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+
+
+@BOMBS
+def test_uploaded_decompression_bomb_is_rejected(client, side):
+    response = client.post('/api/beverages', data={
+        'type': 'cider', 'brand': 'Brand', 'name': 'Cider',
+        'image': (io.BytesIO(_png(side)), 'bomb.png', 'image/png'),
+    })
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'Image has too many pixels to process.'}
+    assert not db.session.scalars(db.select(Beverage)).all()
+
+
+@BOMBS
+def test_fetched_decompression_bomb_fails_the_fetch(app, monkeypatch, side):
+    monkeypatch.setattr(images, 'download_image', lambda url: (_png(side), 'image/png'))
+    fetch = ImageFetch(beverage=CiderDetails(brand='Brand', name='Cider'), url='https://example.com/bomb.png')
+    db.session.add(fetch)
+    db.session.commit()
+
+    run_image_fetch(fetch.id)
+
+    db.session.refresh(fetch)
+    assert fetch.state == 'failed'
+    assert fetch.error == 'Image has too many pixels to process.'
+    assert not fetch.beverage.images
+
+
+def test_image_within_the_pixel_limit_is_stored(client):
+    response = client.post('/api/beverages', data={
+        'type': 'cider', 'brand': 'Brand', 'name': 'Cider',
+        'image': (io.BytesIO(_png(30)), 'cider.png', 'image/png'),
+    })
+    assert response.status_code == 201
+    beverage = db.session.get(Beverage, response.get_json()['id'])
+    assert beverage.images['original'].content_type == 'image/png'
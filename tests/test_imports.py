@@ -0,0 +1,66 @@
+import os
+
+from sqlalchemy import update
+
+from api import imports
+from api.extensions import db
+from api.imports import STALE_JOB_ERROR, _spool_path, run_preview_job
+from api.models import ImportJob
+
+
+def _preview_job():
+    job = ImportJob(kind='preview')
+    db.session.add(job)
+    db.session.commit()
+    with open(_spool_path(job.id), 'wb') as spool:
+        spool.write(b'not a workbook')
+    return job.id
+
+
+def _fail_as_stale(job_id):
+    """What fail_stale_jobs does to a job whose worker went quiet."""
+    db.session.execute(
+        update(ImportJob).where(ImportJob.id == job_id).values(state='failed', errors=[STALE_JOB_ERROR])
+    )
+    db.session.commit()
+
+
+def test_worker_does_not_overwrite_a_job_failed_as_stale(app, monkeypatch):
+    job_id = _preview_job()
+    reports = []
+
+    def slow_parse(stream, report):
+        report(1, 2)
+        _fail_as_stale(job_id)
+        reports.append('after sweep')
+        report(2, 2)
+        reports.append('kept going')
+        return {'beverages': [], 'summary': {'total_rows': 2}}
+
+    monkeypatch.setattr(imports, 'parse_workbook', slow_parse)
+    run_preview_job(job_id, 'token')
+
+    job = db.session.get(ImportJob, job_id)
+    db.session.refresh(job)
+    assert job.state == 'failed'
+    assert job.errors == [STALE_JOB_ERROR]
+    assert job.processed == 1
+    # The first report after the sweep stops the worker.
+    assert reports == ['after sweep']
+    assert not os.path.exists(_spool_path(job_id))
+
+
+def test_worker_does_not_start_a_job_failed_as_stale(app, monkeypatch):
+    job_id = _preview_job()
+    _fail_as_stale(job_id)
+    parsed = []
+    monkeypatch.setattr(imports, 'parse_workbook', lambda stream, report: parsed.append(stream))
+
+    run_preview_job(job_id, 'token')
+
+    assert not parsed
+    job = db.session.get(ImportJob, job_id)
+    db.session.refresh(job)
+    assert job.state == 'failed'
+    assert job.errors == [STALE_JOB_ERROR]
+    assert not os.path.exists(_spool_path(job_id))
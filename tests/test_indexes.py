@@ -0,0 +1,34 @@
+import pytest
+
+from api.extensions import db
+
+
+def _query_plans(client, statements, url):
+    """EXPLAIN QUERY PLAN of every SELECT that serving `url` ran."""
+    statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    connection = db.session.connection()
+    # Iterates over a copy: the EXPLAINs themselves get recorded too.
+    return [
+        ' '.join(row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+        for statement, parameters in list(statements)
+        if statement.lstrip().upper().startswith('SELECT')
+    ]
+
+
+@pytest.mark.parametrize('url, indexes', [
+    ('/api/beverages', {'ix_beverage_brand', 'ix_barcode_beverage_id'}),
+    ('/api/beverages?type=cider', {'ix_beverage_type_brand', 'ix_barcode_beverage_id'}),
+    ('/api/beverages/{beverage_id}', {'ix_barcode_beverage_id', 'ix_rating_beverage_id_score'}),
+    ('/api/users/{user_id}/ratings', {'ix_rating_user_id_created_at'}),
+    ('/api/ratings?since=2000-01-01T00:00:00', {'ix_rating_created_at'}),
+])
+def test_catalog_reads_use_secondary_indexes(client, user, add_ciders, statements, url, indexes):
+    add_ciders(5)
+    plans = _query_plans(client, statements, url.format(beverage_id=1, user_id=user.id))
+    for index in indexes:
+        assert any(index in plan for plan in plans), f'{index} unused by {url}: {plans}'
+    # Child rows are always reached through their foreign key, never by
+    # reading the whole table.
+    assert not [plan for plan in plans if 'SCAN rating' in plan or 'SCAN barcode' in plan]
@@ -0,0 +1,30 @@
+import pytest
+
+
+def _list_queries(client, statements, **params):
+    statements.clear()
+    response = client.get('/api/beverages', query_string={'limit': 100, **params})
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize('params', [{}, {'type': 'cider'}, {'sort': 'average_rating', 'order': 'desc'}])
+def test_listing_query_count_is_independent_of_page_size(client, add_ciders, statements, params):
+    add_ciders(2)
+    few, body = _list_queries(client, statements, **params)
+    assert len(body['items']) == 2
+
+    add_ciders(48)
+    many, body = _list_queries(client, statements, **params)
+    assert len(body['items']) == 50
+
+    assert few == many
+
+
+def test_listing_loads_ratings_and_barcodes_in_batches(client, add_ciders, statements):
+    add_ciders(3)
+    _, body = _list_queries(client, statements)
+    item = body['items'][0]
+    assert item['average_rating'] == 3
+    assert item['rating_count'] == 2
+    assert len(item['barcodes']) == 1